@@ -1,6 +1,21 @@
 # SPDX-FileCopyrightText: 2023-2025 MTS PJSC
 # SPDX-License-Identifier: Apache-2.0
+from typing import TYPE_CHECKING, Any
+
 from horizon_hwm_store.horizon_hwm_store import HorizonHWMStore
 from horizon_hwm_store.version import __version__
 
-__all__ = ["HorizonHWMStore", "__version__"]
+if TYPE_CHECKING:
+    from horizon_hwm_store.async_horizon_hwm_store import AsyncHorizonHWMStore
+
+__all__ = ["AsyncHorizonHWMStore", "HorizonHWMStore", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    # asyncio is imported only if async store is used
+    if name == "AsyncHorizonHWMStore":
+        from horizon_hwm_store.async_horizon_hwm_store import AsyncHorizonHWMStore
+
+        return AsyncHorizonHWMStore
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
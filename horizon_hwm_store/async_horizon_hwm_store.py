@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, TypeVar, Union
+
+from etl_entities.hwm import HWM
+
+from horizon_hwm_store.horizon_hwm_store import HorizonHWMStore
+
+ResultType = TypeVar("ResultType")
+
+
+class AsyncHorizonHWMStore:
+    """
+    Asyncio version of :obj:`HorizonHWMStore <horizon_hwm_store.horizon_hwm_store.HorizonHWMStore>`.
+
+    .. note::
+
+        Horizon client does not provide async implementation, so requests are sent using
+        :obj:`horizon.client.sync.HorizonClientSync` in a thread pool with ``max_workers`` threads.
+        Pool and client (with its HTTP connection pool) are shared by all operations of the store instance,
+        so any number of coroutines can be awaited concurrently without starting new threads.
+
+        Entering ``async with`` block enters the context of the wrapped store, so on exit
+        HWMs buffered in ``write_behind`` mode are flushed, and then the store is closed.
+
+    Parameters
+    ----------
+    **kwargs
+        Same parameters as for :obj:`HorizonHWMStore <horizon_hwm_store.horizon_hwm_store.HorizonHWMStore>`.
+
+    Examples
+    --------
+
+    .. code:: python
+
+        import asyncio
+
+        from horizon_hwm_store import AsyncHorizonHWMStore
+        from horizon.client.auth import LoginPassword
+
+
+        async def main():
+            async with AsyncHorizonHWMStore(
+                api_url="http://horizon-server.domain/api",
+                auth=LoginPassword(login="ldap_login", password="ldap_password"),
+                namespace="namespace",
+            ) as hwm_store:
+                await hwm_store.force_create_namespace()
+                hwms = await asyncio.gather(*(hwm_store.get_hwm(name) for name in names))
+
+
+        asyncio.run(main())
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.store = HorizonHWMStore(**kwargs)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self) -> AsyncHorizonHWMStore:
+        await self._run(self.store.__enter__)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            # pending HWMs of write-behind mode are flushed here
+            await self._run(self.store.__exit__, exc_type, exc_val, exc_tb)
+        finally:
+            await self.close()
+
+    async def get_hwm(self, name: str) -> Optional[HWM]:
+        """Async version of :obj:`HorizonHWMStore.get_hwm`."""
+        return await self._run(self.store.get_hwm, name)
+
+    async def get_hwms(self, names: Iterable[str]) -> Dict[str, Optional[HWM]]:
+        """Async version of :obj:`HorizonHWMStore.get_hwms`."""
+        return await self._run(self.store.get_hwms, list(names))
+
+    async def set_hwm(self, hwm: HWM) -> str:
+        """Async version of :obj:`HorizonHWMStore.set_hwm`."""
+        return await self._run(self.store.set_hwm, hwm)
+
+    async def set_hwms(self, hwms: Iterable[HWM]) -> Dict[str, Union[str, Exception]]:
+        """Async version of :obj:`HorizonHWMStore.set_hwms`."""
+        return await self._run(self.store.set_hwms, list(hwms))
+
+    async def flush(self) -> Dict[str, Union[str, Exception]]:
+        """Async version of :obj:`HorizonHWMStore.flush`."""
+        return await self._run(self.store.flush)
+
+    async def check(self, max_age: Optional[float] = None) -> AsyncHorizonHWMStore:
+        """Async version of :obj:`HorizonHWMStore.check`."""
+        await self._run(self.store.check, max_age)
+        return self
+
+    async def force_create_namespace(self) -> AsyncHorizonHWMStore:
+        """Async version of :obj:`HorizonHWMStore.force_create_namespace`."""
+        await self._run(self.store.force_create_namespace)
+        return self
+
+    async def close(self) -> None:
+        """Wait for running operations, then stop thread pool and close HTTP session."""
+        if self._executor:
+            executor, self._executor = self._executor, None
+            # waiting for running requests should not block the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(executor.shutdown, wait=True))
+        self.store.close()
+
+    async def _run(self, func: Callable[..., ResultType], *args: Any) -> ResultType:
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.store.max_workers,
+                thread_name_prefix=self.__class__.__name__,
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
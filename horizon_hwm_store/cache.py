@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class LRUCache(Generic[KeyType, ValueType]):
+    """
+    Thread-safe in-memory cache with LRU eviction and optional TTL.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of entries. Least recently used entries are evicted first.
+        ``0`` disables caching at all.
+
+    ttl : float, optional
+        Time (in seconds) after which entry is considered expired.
+        If ``None``, entries are expired only by LRU eviction.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[KeyType, Tuple[float, ValueType]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: KeyType) -> Optional[ValueType]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            created_at, value = item
+            if self.ttl is not None and time.monotonic() - created_at > self.ttl:
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: KeyType) -> Optional[ValueType]:
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[1] if item else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
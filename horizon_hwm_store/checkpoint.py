@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+log = logging.getLogger(__name__)
+
+
+class ImportPosition(NamedTuple):
+    offset: int
+    """Position in import file (in bytes) of the first record which is not imported yet"""
+
+    line: int
+    """Number of lines before ``offset``"""
+
+    imported: int
+    """Number of HWMs imported before ``offset``"""
+
+
+class ImportCheckpoint:
+    """
+    Local file with position in import file, up to which all HWMs were imported.
+
+    Checkpoint is bound to size of import file, so if file was replaced, import starts from the beginning.
+
+    Parameters
+    ----------
+    path : :obj:`pathlib.Path`
+        Path to checkpoint file. Parent directories are created automatically.
+
+    source : :obj:`pathlib.Path`
+        Path to import file.
+    """
+
+    def __init__(self, path: Path, source: Path) -> None:
+        self.path = Path(path)
+        self.source = Path(source)
+
+    def read(self) -> ImportPosition:
+        if not self.path.exists():
+            return ImportPosition(offset=0, line=0, imported=0)
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data["size"] == self.source.stat().st_size:
+                return ImportPosition(offset=data["offset"], line=data["line"], imported=data["imported"])
+        except (ValueError, KeyError, TypeError):
+            log.warning("|%s| Checkpoint file %s is malformed, ignoring", self.__class__.__name__, self.path)
+            return ImportPosition(offset=0, line=0, imported=0)
+
+        log.warning(
+            "|%s| Checkpoint file %s was created for another version of %s, ignoring",
+            self.__class__.__name__,
+            self.path,
+            self.source,
+        )
+        return ImportPosition(offset=0, line=0, imported=0)
+
+    def write(self, position: ImportPosition) -> None:
+        data = {"size": self.source.stat().st_size, **position._asdict()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def delete(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    """Requests are sent to the server"""
+
+    OPEN = "open"
+    """Server is considered unavailable, requests are not sent"""
+
+    HALF_OPEN = "half_open"
+    """Reset timeout is expired, next request is sent to check if server is available again"""
+
+
+class CircuitBreakerOpenError(ConnectionError):
+    """Request was not sent because Horizon server is considered unavailable."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After ``failure_threshold`` consecutive failures circuit is opened, and no requests are allowed
+    during ``reset_timeout`` seconds. Then only one request (probe) is allowed.
+    If it succeeds, circuit is closed, otherwise it is opened for another ``reset_timeout`` seconds.
+
+    Parameters
+    ----------
+    failure_threshold : int
+        Number of consecutive failures to open circuit.
+
+    reset_timeout : float
+        Number of seconds after which probe request is allowed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._opened_at is None:
+                return CircuitState.CLOSED
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_timeout:
+                return CircuitState.HALF_OPEN
+            return CircuitState.OPEN
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                log.info("|%s| Horizon is available again, closing circuit", self.__class__.__name__)
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+                log.warning(
+                    "|%s| Horizon is unavailable after %d failed requests, opening circuit for %s seconds",
+                    self.__class__.__name__,
+                    self._failures,
+                    self.reset_timeout,
+                )
+                self._opened_at = time.monotonic()
+                self._probing = False
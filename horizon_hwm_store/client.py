@@ -0,0 +1,257 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import gzip
+import hashlib
+import inspect
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from horizon.client.auth.base import BaseAuth
+from horizon.client.sync import HorizonClientSync
+from horizon.commons.exceptions import AuthorizationError
+from pydantic import PrivateAttr, root_validator
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from horizon_hwm_store.deadline import (
+    OperationTimeoutError,
+    check_deadline,
+    get_remaining_time,
+)
+from horizon_hwm_store.executor import is_inline
+from horizon_hwm_store.hedging import HedgingPolicy
+from horizon_hwm_store.token_cache import TokenCache
+
+log = logging.getLogger(__name__)
+
+ResultType = TypeVar("ResultType")
+
+
+class HorizonClient(HorizonClientSync):
+    """
+    :obj:`horizon.client.sync.HorizonClientSync` with additional features used by ``HorizonHWMStore``.
+
+    Parameters
+    ----------
+    token_cache : :obj:`TokenCache <horizon_hwm_store.token_cache.TokenCache>`, optional
+        If set, access token is taken from cache instead of sending login request,
+        and new tokens are saved to this cache. Cached token which was rejected by server
+        is removed from the cache, and then new token is fetched.
+
+    compression_threshold : int, optional
+        If set, request bodies larger than this number of bytes are compressed using gzip.
+        Server should support ``Content-Encoding: gzip`` requests.
+
+    hedge_percentile : float, optional
+        If set, read requests (``paginate_hwm``, ``get_hwm``, ``paginate_namespaces``) are hedged
+        using :obj:`HedgingPolicy <horizon_hwm_store.hedging.HedgingPolicy>` with this percentile.
+
+    hedge_min_delay : float, default: ``0.05``
+        Minimal delay before sending hedged request, in seconds.
+
+    hedge_max_extra_load : float, default: ``0.1``
+        Max ratio of hedged requests to all read requests.
+    """
+
+    token_cache: Optional[TokenCache] = None
+    compression_threshold: Optional[int] = None
+    hedge_percentile: Optional[float] = None
+    hedge_min_delay: float = 0.05
+    hedge_max_extra_load: float = 0.1
+
+    _token_from_cache: bool = PrivateAttr(default=False)
+    _hedging: Optional[HedgingPolicy] = PrivateAttr(default=None)
+    _hedging_executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**data)
+        if self.hedge_percentile is not None:
+            self._hedging = HedgingPolicy(
+                percentile=self.hedge_percentile,
+                min_delay=self.hedge_min_delay,
+                max_extra_load=self.hedge_max_extra_load,
+            )
+            self._hedging_executor = ThreadPoolExecutor(thread_name_prefix=self.__class__.__name__)
+
+    def paginate_hwm(self, query):
+        return self._hedged(partial(super().paginate_hwm, query))
+
+    def get_hwm(self, hwm_id: int):
+        return self._hedged(partial(super().get_hwm, hwm_id))
+
+    def paginate_namespaces(self, query=None):
+        return self._hedged(partial(super().paginate_namespaces, query))
+
+    def close(self) -> None:
+        if self._hedging_executor:
+            # slow requests which lost the race are not awaited
+            self._hedging_executor.shutdown(wait=False)
+        super().close()
+
+    def authorize(self) -> None:
+        session = self.session
+        token = self.token_cache.get(self._token_cache_key) if self.token_cache else None
+        if token:
+            session.token = token  # type: ignore[union-attr]
+            self._token_from_cache = True
+            return
+
+        super().authorize()
+        self._token_from_cache = False
+        if self.token_cache and session.token:  # type: ignore[union-attr]
+            self.token_cache.set(self._token_cache_key, dict(session.token))  # type: ignore[union-attr]
+
+    def _hedged(self, func: Callable[[], ResultType]) -> ResultType:
+        if not self._hedging or is_inline():
+            return func()
+        # deadline of the current operation should be applied to requests sent by other threads.
+        # Context cannot be entered by multiple threads at once, so each request uses its own copy
+        context = copy_context()
+        return self._hedging.run(
+            self._hedging_executor,  # type: ignore[arg-type]
+            lambda: context.copy().run(func),
+        )
+
+    def _request(self, *args, **kwargs):
+        try:
+            return super()._request(*args, **kwargs)
+        except AuthorizationError:
+            if not self._token_from_cache:
+                raise
+
+        # cached token was revoked, or it was issued by another server
+        self.token_cache.delete(self._token_cache_key)  # type: ignore[union-attr]
+        self.session.token = None  # type: ignore[union-attr]
+        self._token_from_cache = False
+        return super()._request(*args, **kwargs)
+
+    # called after retries are configured by parent class
+    @root_validator(pre=False, skip_on_failure=True)
+    def _configure_adapters(cls, values):  # noqa: N805
+        threshold = values.get("compression_threshold")
+        session = values["session"]
+        for prefix in ("https://", "http://"):
+            max_retries = DeadlineRetry.from_retry(session.get_adapter(prefix).max_retries)
+            if threshold is None:
+                session.mount(prefix, DeadlineHTTPAdapter(max_retries=max_retries))
+            else:
+                session.mount(prefix, GzipHTTPAdapter(threshold=threshold, max_retries=max_retries))
+        return values
+
+    @property
+    def _token_cache_key(self) -> str:
+        return hashlib.sha256(f"{self.base_url}|{get_auth_identity(self.auth)}".encode("utf-8")).hexdigest()
+
+
+def get_auth_identity(auth: BaseAuth) -> str:
+    """Return hash of auth credentials, which can be safely used as a key in caches."""
+    auth_values = {
+        name: value.get_secret_value() if hasattr(value, "get_secret_value") else value
+        for name, value in auth.dict().items()  # type: ignore[attr-defined]
+    }
+    return hashlib.sha256(json.dumps(auth_values, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class DeadlineRetry(Retry):
+    """
+    ``urllib3`` retry policy which respects deadline of the current operation,
+    see :obj:`deadline <horizon_hwm_store.deadline.deadline>`.
+
+    Retries are stopped after deadline is passed, and sleep between retries does not exceed remaining time.
+    """
+
+    @classmethod
+    def from_retry(cls, retry: Union[Retry, int, None]) -> DeadlineRetry:
+        if not isinstance(retry, Retry):
+            return cls.from_int(retry)  # type: ignore[return-value]
+
+        options = inspect.signature(Retry.__init__).parameters
+        return cls(**{name: getattr(retry, name) for name in options if name != "self" and hasattr(retry, name)})
+
+    def is_exhausted(self) -> bool:
+        remaining = get_remaining_time()
+        return super().is_exhausted() or (remaining is not None and remaining <= 0)
+
+    def get_backoff_time(self) -> float:
+        return self._clamp(super().get_backoff_time())
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return self._clamp(retry_after) if retry_after is not None else None
+
+    @staticmethod
+    def _clamp(seconds: float) -> float:
+        remaining = get_remaining_time()
+        if remaining is None:
+            return seconds
+        return max(min(seconds, remaining), 0)
+
+
+class DeadlineHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter which does not wait for response longer than remaining time of the current operation,
+    see :obj:`deadline <horizon_hwm_store.deadline.deadline>`.
+
+    If deadline is passed, :obj:`OperationTimeoutError <horizon_hwm_store.deadline.OperationTimeoutError>`
+    is raised instead of connection or timeout errors.
+    """
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:  # type: ignore[override]
+        check_deadline()
+        remaining = get_remaining_time()
+        if remaining is not None:
+            kwargs["timeout"] = _clamp_timeout(kwargs.get("timeout"), remaining)
+
+        try:
+            return super().send(request, *args, **kwargs)
+        except Exception as e:
+            remaining = get_remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise OperationTimeoutError(f"Operation timeout exceeded while sending {request.method} request") from e
+            raise
+
+
+def _clamp_timeout(timeout: Any, remaining: float) -> Any:
+    """Limit ``requests`` timeout (single value or ``(connect, read)`` tuple) by remaining time."""
+    if isinstance(timeout, tuple):
+        return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+class GzipHTTPAdapter(DeadlineHTTPAdapter):
+    """
+    HTTP adapter compressing request bodies larger than ``threshold`` bytes using gzip.
+
+    Compressed responses are handled by ``requests`` itself, based on ``Accept-Encoding`` header.
+    """
+
+    def __init__(self, threshold: int, **kwargs) -> None:
+        self.threshold = threshold
+        super().__init__(**kwargs)
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:  # type: ignore[override]
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        if isinstance(body, bytes) and len(body) > self.threshold and "Content-Encoding" not in request.headers:
+            compressed = gzip.compress(body, compresslevel=6)
+            log.debug(
+                "|%s| Compressed request body from %d to %d bytes (ratio %.1f)",
+                self.__class__.__name__,
+                len(body),
+                len(compressed),
+                len(body) / max(len(compressed), 1),
+            )
+            request.body = compressed
+            request.headers["Content-Encoding"] = "gzip"
+            request.headers["Content-Length"] = str(len(compressed))
+
+        return super().send(request, *args, **kwargs)
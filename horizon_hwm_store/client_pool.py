@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+from horizon.client.auth.base import BaseAuth
+
+from horizon_hwm_store.client import HorizonClient, get_auth_identity
+
+log = logging.getLogger(__name__)
+
+ClientKey = Tuple[str, str, str]
+
+
+class HorizonClientPool:
+    """
+    Process-wide registry of :obj:`HorizonClient <horizon_hwm_store.client.HorizonClient>` instances.
+
+    Stores with the same API URL, credentials and client options (like retry and timeout configuration)
+    share the same client, so login request is sent only once, and HTTP connections are reused.
+
+    Each :obj:`acquire` call should be followed by :obj:`release` call.
+    Client is closed after it was released by all its users, or on interpreter exit.
+    """
+
+    _clients: Dict[ClientKey, HorizonClient] = {}
+    _refcounts: Dict[ClientKey, int] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, base_url: str, auth: BaseAuth, **kwargs: Any) -> HorizonClient:
+        # secrets are not stored in plain text, only their hash
+        key = (base_url, get_auth_identity(auth), json.dumps(kwargs, sort_keys=True, default=_to_json))
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                log.debug("|%s| Creating new client for %r", cls.__name__, base_url)
+                client = HorizonClient(base_url=base_url, auth=auth, **kwargs)  # type: ignore[arg-type]
+                cls._clients[key] = client
+                cls._refcounts[key] = 0
+
+            cls._refcounts[key] += 1
+            return client
+
+    @classmethod
+    def release(cls, client: HorizonClient) -> None:
+        with cls._lock:
+            for key, pooled_client in cls._clients.items():
+                if pooled_client is client:
+                    break
+            else:
+                return
+
+            cls._refcounts[key] -= 1
+            if cls._refcounts[key] > 0:
+                return
+
+            del cls._clients[key]
+            del cls._refcounts[key]
+
+        log.debug("|%s| Closing client for %r", cls.__name__, str(client.base_url))
+        client.close()
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            clients = list(cls._clients.values())
+            cls._clients.clear()
+            cls._refcounts.clear()
+
+        for client in clients:
+            client.close()
+
+
+def _to_json(value: Any) -> Any:
+    if hasattr(value, "dict"):
+        return value.dict()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+atexit.register(HorizonClientPool.close_all)
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# monotonic time when current operation should be finished
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("horizon_hwm_store_deadline", default=None)
+
+
+class OperationTimeoutError(TimeoutError):
+    """Operation was not finished within ``operation_timeout``."""
+
+
+@contextmanager
+def deadline(timeout: Optional[float]) -> Iterator[None]:
+    """
+    Limit total time of all requests sent within the block, including retries.
+
+    Nested deadline cannot extend the outer one. ``None`` means no limit (or limit of the outer block).
+
+    .. note::
+
+        Deadline is stored in :obj:`contextvars.ContextVar`, so it is not passed to threads automatically.
+        Use :obj:`contextvars.copy_context` to run functions in other threads within the same deadline.
+    """
+    current = _DEADLINE.get()
+    if timeout is None:
+        yield
+        return
+
+    new_deadline = time.monotonic() + timeout
+    token = _DEADLINE.set(new_deadline if current is None else min(current, new_deadline))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def get_remaining_time() -> Optional[float]:
+    """Return number of seconds left before deadline (can be negative), or ``None`` if there is no deadline."""
+    current = _DEADLINE.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+def check_deadline() -> None:
+    """Raise :obj:`OperationTimeoutError` if deadline is already passed."""
+    remaining = get_remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise OperationTimeoutError("Operation timeout exceeded, request was not sent")
@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_INLINE: ContextVar[bool] = ContextVar("horizon_hwm_store_inline", default=False)
+
+
+@contextmanager
+def run_inline() -> Iterator[None]:
+    """
+    Run all functions called within the block in the calling thread, instead of sending them to thread pools.
+
+    Used in :obj:`atexit` hooks: ``concurrent.futures`` is shut down before they are called,
+    so new tasks cannot be submitted to any executor.
+    """
+    token = _INLINE.set(True)
+    try:
+        yield
+    finally:
+        _INLINE.reset(token)
+
+
+def is_inline() -> bool:
+    """Return ``True`` if called within :obj:`run_inline` block."""
+    return _INLINE.get()
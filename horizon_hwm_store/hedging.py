@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Callable, Deque, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+ResultType = TypeVar("ResultType")
+
+
+class HedgingPolicy:
+    """
+    Sends duplicate (hedged) request if the first one did not respond in time, and returns the first response.
+
+    Hedging delay is calculated as ``percentile`` of latencies of the last ``window`` requests,
+    but not less than ``min_delay``. Until ``min_samples`` latencies are collected, requests are not hedged.
+
+    To avoid overloading the server which is slow for all requests, each request adds ``max_extra_load``
+    tokens to the budget (up to ``max_burst`` tokens), and each hedged request consumes one token.
+    So there are at most ``max_extra_load * number of requests`` hedged requests.
+
+    Parameters
+    ----------
+    percentile : float
+        Percentile of latencies, in range ``(0, 100)``.
+
+    min_delay : float
+        Minimal hedging delay, in seconds.
+
+    max_extra_load : float
+        Max ratio of hedged requests to all requests, in range ``(0, 1]``.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        min_delay: float,
+        max_extra_load: float,
+        window: int = 1000,
+        min_samples: int = 20,
+        max_burst: float = 10,
+    ) -> None:
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_extra_load = max_extra_load
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def get_delay(self) -> Optional[float]:
+        """Return current hedging delay, or ``None`` if there are not enough latency samples yet."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+
+        index = max(math.ceil(len(latencies) * self.percentile / 100) - 1, 0)
+        return max(latencies[index], self.min_delay)
+
+    def run(self, executor: Executor, func: Callable[[], ResultType]) -> ResultType:
+        """
+        Call ``func``, and if it did not return within hedging delay, call it again using ``executor``.
+
+        Result of the first successful call is returned. If both calls failed, exception of the first one is raised.
+        """
+        with self._lock:
+            self._tokens = min(self._tokens + self.max_extra_load, self.max_burst)
+
+        delay = self.get_delay()
+        if delay is None:
+            return self._measure(func)
+
+        primary = executor.submit(self._measure, func)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._acquire_token():
+            return primary.result()
+
+        log.debug("|%s| No response within %.3fs, sending hedged request", self.__class__.__name__, delay)
+        hedged = executor.submit(self._measure, func)
+        pending = {primary, hedged}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+
+        return primary.result()
+
+    def _measure(self, func: Callable[[], ResultType]) -> ResultType:
+        start = time.monotonic()
+        result = func()
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return result
+
+    def _acquire_token(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
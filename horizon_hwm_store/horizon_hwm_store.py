@@ -2,20 +2,106 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-from typing import Optional, cast
+import atexit
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import closing, contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+from urllib.parse import urlencode
 
 from etl_entities.hwm import HWM, HWMTypeRegistry
 from etl_entities.hwm_store import BaseHWMStore, register_hwm_store_class
-from horizon.client.auth import LoginPassword
-from horizon.client.sync import HorizonClientSync, RetryConfig, TimeoutConfig
-from horizon.commons.exceptions import EntityAlreadyExistsError
-from horizon.commons.schemas.v1 import (
-    HWMCreateRequestV1,
-    HWMPaginateQueryV1,
-    HWMUpdateRequestV1,
-    NamespaceCreateRequestV1,
-    NamespacePaginateQueryV1,
-    NamespaceResponseV1,
+from horizon.commons.exceptions import (
+    EntityAlreadyExistsError,
+    EntityNotFoundError,
+    ServiceError,
+)
+
+from horizon_hwm_store.cache import LRUCache
+from horizon_hwm_store.checkpoint import ImportCheckpoint, ImportPosition
+from horizon_hwm_store.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitState,
+)
+from horizon_hwm_store.deadline import (
+    OperationTimeoutError,
+    deadline,
+    get_remaining_time,
+)
+from horizon_hwm_store.executor import is_inline, run_inline
+from horizon_hwm_store.journal import HWMJournal
+from horizon_hwm_store.segments import (
+    SEGMENT_CODECS,
+    Segment,
+    get_base_type,
+    get_segment_name,
+    get_segmented_type,
+    is_segment_name,
+    is_segmented_type,
+    plan_segments,
+)
+from horizon_hwm_store.token_cache import TokenCache
+
+# Horizon client, its dependencies and request/response schemas take most of the import time,
+# so they are imported only when the store is created or used. sqlite3 is imported only if local cache is enabled
+if TYPE_CHECKING:
+    from horizon.client.auth import LoginPassword
+    from horizon.client.sync import RetryConfig, TimeoutConfig
+    from horizon.commons.schemas.v1 import (
+        HWMResponseV1,
+        NamespaceResponseV1,
+        PageResponseV1,
+    )
+
+    from horizon_hwm_store.client import HorizonClient
+    from horizon_hwm_store.local_cache import LocalHWMCache
+
+log = logging.getLogger(__name__)
+
+# max page size allowed by Horizon API
+MAX_PAGE_SIZE = 50
+
+InputType = TypeVar("InputType")
+ResultType = TypeVar("ResultType")
+
+# HWM fields which can be changed by update request
+HWM_FIELDS = ("name", "description", "type", "value", "entity", "expression")
+
+# shared by all store instances within the process:
+# (api_url, namespace) -> (cached_at, namespace_id)
+_NAMESPACE_IDS: LRUCache[Tuple[str, str], Tuple[float, int]] = LRUCache(max_size=1000)
+# (api_url, auth identity, namespace) -> time of last successful check()
+_CHECKED_AT: LRUCache[Tuple[str, str, str], float] = LRUCache(max_size=1000)
+# set only in background prefetch thread: names of HWMs written since prefetch was started,
+# ``None`` item means that all HWMs were invalidated
+_PREFETCH_WRITES: ContextVar[Optional[Set[Optional[str]]]] = ContextVar(
+    "horizon_hwm_store_prefetch_writes",
+    default=None,
 )
 
 try:
@@ -28,6 +114,27 @@ except ImportError:
         validator,
     )
 
+# classes with resolved field annotations, see HorizonHWMStore._resolve_field_types
+_RESOLVED_CLASSES: Set[type] = set()
+
+
+def _import_field_types() -> Dict[str, type]:
+    from horizon.client.auth import LoginPassword
+    from horizon.client.sync import RetryConfig, TimeoutConfig
+
+    return {"LoginPassword": LoginPassword, "RetryConfig": RetryConfig, "TimeoutConfig": TimeoutConfig}
+
+
+def _operation(method: Callable[..., ResultType]) -> Callable[..., ResultType]:
+    """Limit total time of all requests sent by store method to ``operation_timeout``."""
+
+    @functools.wraps(method)
+    def wrapper(self: HorizonHWMStore, *args, **kwargs) -> ResultType:
+        with deadline(self.operation_timeout):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 @register_hwm_store_class("horizon")
 class HorizonHWMStore(BaseHWMStore):
@@ -55,6 +162,182 @@ class HorizonHWMStore(BaseHWMStore):
     timeout : :obj:`horizon.client.sync.TimeoutConfig`
         Configuration for request timeouts.
 
+    hwm_id_cache_size : int, default: ``1000``
+        Max number of HWM name → id pairs cached by the store instance,
+        to avoid resolving the same HWM id on each ``get_hwm`` / ``set_hwm`` call.
+        Least recently used entries are evicted first. ``0`` disables the cache.
+
+    hwm_id_cache_ttl : float, optional
+        Time (in seconds) after which cached HWM id is resolved again.
+        By default, entries are evicted only if cache is full, or if server
+        responded that HWM with cached id does not exist anymore.
+
+    max_workers : int, default: ``8``
+        Max number of concurrent requests sent by bulk methods, like ``get_hwms`` and ``set_hwms``.
+
+    write_behind : bool, default: ``False``
+        If ``True``, ``set_hwm`` does not send HWM to the server immediately, but keeps it in memory.
+        Multiple updates of the same HWM are coalesced, and only the latest value is sent
+        by :obj:`flush` method, which is called on exiting the store context.
+        Pending HWMs are returned by ``get_hwm`` before they are flushed.
+
+        Pending HWMs are also flushed on interpreter exit. If process was killed or crashed,
+        pending HWMs are lost, unless ``write_behind_journal`` is set.
+
+    write_behind_journal : :obj:`pathlib.Path`, optional
+        Path to local journal file. If set, each HWM buffered in ``write_behind`` mode is appended to this file
+        (and synced to disk) before ``set_hwm`` returns, and removed from it after being successfully flushed.
+        HWMs left in journal by crashed process are loaded on entering the store context,
+        and flushed together with new ones.
+
+    local_cache_path : :obj:`pathlib.Path`, optional
+        Path to local SQLite database used as persistent cache of namespace id, HWM ids and values.
+        Cache survives process restart, so short-lived processes do not need to resolve the same
+        namespace and HWM ids on each run. The same file can be used by multiple processes and stores.
+
+    local_cache_max_entries : int, default: ``10000``
+        Max number of HWMs in local cache. Least recently accessed entries are removed first.
+
+    local_cache_ttl : float, optional
+        Time (in seconds) during which HWM value from local cache is returned by ``get_hwm``
+        without sending any requests. After that value is revalidated by fetching it from the server.
+        By default, values are always revalidated, and only namespace and HWM ids are taken from the cache.
+
+    delta_writes : bool, default: ``False``
+        If ``True``, value of :obj:`etl_entities.hwm.FileListHWM` and :obj:`etl_entities.hwm.KeyValueIntHWM`
+        is stored as multiple segments, and ``set_hwm`` sends only the part of value changed since the previous write
+        (e.g. new paths, or offsets of Kafka partitions which received new data), instead of sending the entire value.
+        ``get_hwm`` reads all segments and returns HWM with full value, so this is transparent for users.
+
+        Segments are stored as separate HWMs with names like ``some_hwm#segment-0``,
+        and HWM itself contains only metadata and a list of its segments. Such HWMs
+        cannot be read by stores created with ``delta_writes=False`` or by older versions of the library.
+        Existing HWMs are converted to segmented format on the first write.
+
+        .. warning::
+
+            HWM with delta writes should be saved by only one process at a time.
+
+    max_segments : int, default: ``16``
+        Max number of segments of one HWM. New segment is merged with previous ones if they are not larger,
+        so usually there are much less segments. If there are still more than ``max_segments``,
+        or value cannot be represented as a change of the previous one (some paths or keys were removed,
+        or some offsets were decreased), all segments are compacted into one.
+
+    session_cache_ttl : float, optional
+        If set, HWMs read or written within the store context (``with store: ...``) are cached in memory
+        during this time (in seconds), and returned by ``get_hwm`` / ``get_hwms`` without sending any requests.
+        Cache is cleared on entering and exiting the context, so values are never shared between different contexts.
+        Cache can also be cleared explicitly using :obj:`invalidate` method.
+        By default, session cache is disabled.
+
+    force_writes : bool, default: ``False``
+        By default, store remembers the last HWM value it read from or written to the server
+        (up to ``hwm_id_cache_size`` HWMs, during ``hwm_id_cache_ttl`` seconds),
+        and skips saving HWM if its value and metadata are the same. This reduces server load and
+        HWM history growth caused by runs without new data. Number of skipped writes is available
+        via :obj:`suppressed_writes` property.
+
+        If HWM can be changed by other processes between reading and saving it,
+        pass ``True`` to always send HWM to the server.
+
+    namespace_id_cache_ttl : float, optional, default: ``3600``
+        Namespace id resolved by any store is cached within the process (and in ``local_cache_path``, if set),
+        and reused by other stores with the same ``api_url`` and ``namespace`` during this time (in seconds).
+        So creating new store instance does not require new namespace lookup request.
+        ``None`` means that cached namespace id is never expired.
+        If server responded that namespace with cached id does not exist, it is resolved again by the next operation.
+
+    share_client : bool, default: ``True``
+        If ``True``, stores with the same ``api_url``, ``auth``, ``retry`` and ``timeout`` share
+        the same Horizon client within the process, including its access token and HTTP connection pool.
+        So creating new store instance (e.g. by ``detect_hwm_store`` for each pipeline step)
+        does not require new login request and new connections.
+
+    token_cache : bool, default: ``True``
+        If ``True``, access token received after login is cached in memory of the current process,
+        and reused by all stores with the same ``api_url`` and ``auth`` until token is expired.
+        If server responded that cached token is invalid, new token is fetched.
+
+    token_cache_path : :obj:`pathlib.Path`, optional
+        Path to file where access tokens are cached, so they can be reused by other processes
+        instead of sending login request on each process start.
+        File is created with ``0600`` permissions, and ignored if it is accessible by other users.
+        Requires ``token_cache=True``.
+
+    compression_threshold : int, optional
+        If set, request bodies (e.g. large ``FileListHWM`` or ``KeyValueIntHWM`` values)
+        larger than this number of bytes are compressed using gzip. Compression ratio is logged with ``DEBUG`` level.
+        Horizon server (or reverse proxy in front of it) should support requests with ``Content-Encoding: gzip``.
+        By default, requests are not compressed.
+
+        Responses are always requested with ``Accept-Encoding: gzip, deflate``, and decompressed automatically.
+
+    circuit_breaker_threshold : int, optional
+        If set, store works in tiered mode. After this number of consecutive operations failed
+        because Horizon is unavailable (connection errors, timeouts, ``5xx`` responses), circuit breaker is opened,
+        and during ``circuit_breaker_reset_timeout`` seconds requests are not sent at all:
+
+        * ``get_hwm`` returns the last known HWM value from local cache (see ``local_cache_path``),
+          ignoring ``local_cache_ttl``. If HWM is not cached locally,
+          :obj:`CircuitBreakerOpenError <horizon_hwm_store.circuit_breaker.CircuitBreakerOpenError>` is raised.
+        * ``set_hwm`` queues HWM in memory and in journal (see ``write_behind_journal``), like in ``write_behind`` mode.
+          Queued changes are sent to the server (only the latest value of each HWM) before the next successful
+          operation, or on exiting the store context. If Horizon is still unavailable on exit,
+          changes are kept in the journal and sent by the next store using the same journal.
+
+        Operations which failed while circuit breaker was closed also fall back to local cache and journal.
+        Breaker state and age of the oldest queued change are available via :obj:`circuit_state`
+        and :obj:`replay_lag` properties. By default, tiered mode is disabled.
+
+        Requires ``local_cache_path`` and ``write_behind_journal`` to be set, so reads have a local snapshot
+        to fall back to, and queued changes are not lost if the process is stopped.
+
+    circuit_breaker_reset_timeout : float, default: ``30``
+        Number of seconds after opening circuit breaker, when one operation is allowed to check
+        if Horizon is available again. If it fails, circuit breaker is opened again for the same time.
+
+    hedge_percentile : float, optional
+        If set, read requests (HWM and namespace lookups) are hedged, to reduce tail latency caused
+        by slow server replicas. If server did not respond within this percentile of latencies of recent
+        read requests (e.g. ``95``), the same request is sent again, and the first response is used.
+        Latencies are collected by the client, so hedging starts after 20 read requests.
+        By default, requests are not hedged.
+
+    hedge_min_delay : float, default: ``0.05``
+        Minimal delay (in seconds) before sending hedged request, even if most requests are faster.
+
+    hedge_max_extra_load : float, default: ``0.1``
+        Max ratio of hedged requests to all read requests. If server is slow for all requests,
+        hedging stops after reaching this limit, instead of doubling the server load.
+
+    operation_timeout : float, optional
+        Max time (in seconds) of one store operation, like ``get_hwm`` or ``set_hwm``.
+        Operation may send multiple requests (e.g. namespace lookup, HWM lookup and HWM fetch),
+        each one with its own retries. ``timeout`` and ``retry`` options are applied to each request separately,
+        while ``operation_timeout`` limits all of them together: request timeouts and sleep between retries
+        are reduced to fit the remaining time, and no new requests or retries are sent after it is exceeded.
+        Then :obj:`OperationTimeoutError <horizon_hwm_store.deadline.OperationTimeoutError>`
+        (subclass of :obj:`TimeoutError`) is raised.
+
+        Applied to ``get_hwm``, ``get_hwms``, ``set_hwm``, ``set_hwms``, ``flush``, ``check``
+        and ``force_create_namespace``, but not to iterators, export and import methods.
+        By default, there is no limit.
+
+    prefetch_hwms : List[str], default: ``[]``
+        Names of HWMs which will be used by the pipeline. They are fetched in background on entering
+        the store context, see :obj:`prefetch`. Can be set in ``detect_hwm_store`` config, e.g.:
+
+        .. code:: yaml
+
+            hwm_store:
+              horizon:
+                api_url: http://horizon-server.domain/api
+                namespace: namespace
+                prefetch_hwms:
+                  - some_hwm
+                  - another_hwm
+
     Examples
     --------
 
@@ -151,51 +434,714 @@ class HorizonHWMStore(BaseHWMStore):
     api_url: AnyHttpUrl
     auth: LoginPassword
     namespace: str
-    retry: RetryConfig = Field(default_factory=RetryConfig)
-    timeout: TimeoutConfig = Field(default_factory=TimeoutConfig)
-    _client: Optional[HorizonClientSync] = PrivateAttr(default=None)
+    retry: RetryConfig = Field(default_factory=lambda: _import_field_types()["RetryConfig"]())
+    timeout: TimeoutConfig = Field(default_factory=lambda: _import_field_types()["TimeoutConfig"]())
+    hwm_id_cache_size: int = Field(default=1000, ge=0)
+    hwm_id_cache_ttl: Optional[float] = Field(default=None, gt=0)
+    max_workers: int = Field(default=8, gt=0)
+    write_behind: bool = False
+    write_behind_journal: Optional[Path] = None
+    local_cache_path: Optional[Path] = None
+    local_cache_max_entries: int = Field(default=10000, gt=0)
+    local_cache_ttl: Optional[float] = Field(default=None, gt=0)
+    delta_writes: bool = False
+    max_segments: int = Field(default=16, gt=0)
+    session_cache_ttl: Optional[float] = Field(default=None, gt=0)
+    force_writes: bool = False
+    namespace_id_cache_ttl: Optional[float] = Field(default=3600, gt=0)
+    share_client: bool = True
+    token_cache: bool = True
+    token_cache_path: Optional[Path] = None
+    compression_threshold: Optional[int] = Field(default=None, ge=0)
+    circuit_breaker_threshold: Optional[int] = Field(default=None, gt=0)
+    circuit_breaker_reset_timeout: float = Field(default=30, gt=0)
+    hedge_percentile: Optional[float] = Field(default=None, gt=0, lt=100)
+    hedge_min_delay: float = Field(default=0.05, ge=0)
+    hedge_max_extra_load: float = Field(default=0.1, gt=0, le=1)
+    operation_timeout: Optional[float] = Field(default=None, gt=0)
+    prefetch_hwms: List[str] = Field(default_factory=list)
+    _client: Optional[HorizonClient] = PrivateAttr(default=None)
+    _client_shared: bool = PrivateAttr(default=False)
     _namespace_id: Optional[int] = PrivateAttr(default=None)
+    _hwm_ids: LRUCache[Tuple[int, str], int] = PrivateAttr()
+    # (namespace_id, name) -> (hwm_id, serialized HWM fields) of the last HWM read from or written to the server
+    _known_hwms: LRUCache[Tuple[int, str], Tuple[int, str]] = PrivateAttr()
+    _suppressed_writes: int = PrivateAttr(default=0)
+    _session_hwms: LRUCache[str, HWM] = PrivateAttr()
+    # (namespace_id, name) -> segments of HWM, as they are stored on server
+    _segments: LRUCache[Tuple[int, str], List[Segment]] = PrivateAttr()
+    _context_depth: int = PrivateAttr(default=0)
+    _suppressed_writes_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _pending_hwms: Dict[str, HWM] = PrivateAttr(default_factory=dict)
+    _pending_lock: Any = PrivateAttr(default_factory=threading.RLock)
+    _journal: Optional[HWMJournal] = PrivateAttr(default=None)
+    _local_cache: Optional[LocalHWMCache] = PrivateAttr(default=None)
+    # time of the oldest HWM change which was not sent to the server yet
+    _pending_since: Optional[float] = PrivateAttr(default=None)
+    _circuit_breaker: Optional[CircuitBreaker] = PrivateAttr(default=None)
+    # name -> result of background get_hwms call, containing this HWM
+    _prefetched: Dict[str, Future] = PrivateAttr(default_factory=dict)
+    _prefetch_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _prefetch_executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    # names of HWMs written since each running prefetch was started
+    _prefetch_writes: List[Set[Optional[str]]] = PrivateAttr(default_factory=list)
+
+    def __init__(self, **kwargs):
+        self._resolve_field_types()
+        super().__init__(**kwargs)
+        self._hwm_ids = LRUCache(max_size=self.hwm_id_cache_size, ttl=self.hwm_id_cache_ttl)
+        self._known_hwms = LRUCache(max_size=self.hwm_id_cache_size, ttl=self.hwm_id_cache_ttl)
+        self._segments = LRUCache(max_size=self.hwm_id_cache_size, ttl=self.hwm_id_cache_ttl)
+        self._session_hwms = LRUCache(
+            max_size=self.hwm_id_cache_size if self.session_cache_ttl else 0,
+            ttl=self.session_cache_ttl,
+        )
+        if self.write_behind_journal:
+            self._journal = HWMJournal(self.write_behind_journal)
+        if self.local_cache_path:
+            from horizon_hwm_store.local_cache import LocalHWMCache
+
+            self._local_cache = LocalHWMCache(
+                path=self.local_cache_path,
+                api_url=str(self.api_url),
+                namespace=self.namespace,
+                max_entries=self.local_cache_max_entries,
+            )
+        if self.circuit_breaker_threshold:
+            self._circuit_breaker = CircuitBreaker(
+                failure_threshold=self.circuit_breaker_threshold,
+                reset_timeout=self.circuit_breaker_reset_timeout,
+            )
+
+    def __enter__(self):
+        if self._journal:
+            self._load_journal()
+        self._session_hwms.clear()
+        self._context_depth += 1  # noqa: WPS601
+        if self.prefetch_hwms:
+            self.prefetch(self.prefetch_hwms)
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._flush_pending(raise_errors=exc_type is None)
+        finally:
+            self._context_depth -= 1  # noqa: WPS601
+            self._session_hwms.clear()
+            self._mark_written(None)
+            super().__exit__(exc_type, exc_value, traceback)
+        return False
+
+    @property
+    def suppressed_writes(self) -> int:
+        """Number of HWM writes skipped because HWM value and metadata were not changed. See ``force_writes``."""
+        return self._suppressed_writes
 
     @property
-    def client(self) -> HorizonClientSync:
+    def circuit_state(self) -> CircuitState:
+        """State of circuit breaker, see ``circuit_breaker_threshold``. Always ``closed`` if tiered mode is disabled."""
+        if not self._circuit_breaker:
+            return CircuitState.CLOSED
+        return self._circuit_breaker.state
+
+    @property
+    def replay_lag(self) -> float:
+        """
+        Number of seconds since the oldest HWM change which was queued (by ``write_behind`` or tiered mode),
+        but not sent to the server yet. ``0`` if there are no queued changes.
+        """
+        pending_since = self._pending_since
+        if pending_since is None:
+            return 0
+        return max(time.time() - pending_since, 0)
+
+    @classmethod
+    def schema(cls, *args, **kwargs):
+        cls._resolve_field_types()
+        return super().schema(*args, **kwargs)
+
+    @classmethod
+    def validate(cls, value):
+        cls._resolve_field_types()
+        return super().validate(value)
+
+    @property
+    def client(self) -> HorizonClient:
+        from horizon_hwm_store.client import HorizonClient
+        from horizon_hwm_store.client_pool import HorizonClientPool
+
         if not self._client:
-            self._client = HorizonClientSync(  # noqa: WPS601
-                base_url=str(self.api_url),  # type: ignore[arg-type]
-                auth=self.auth,
-                retry=self.retry,
-                timeout=self.timeout,
-            )
+            client_options = {
+                "base_url": str(self.api_url),
+                "auth": self.auth,
+                "retry": self.retry,
+                "timeout": self.timeout,
+                "token_cache": TokenCache(self.token_cache_path) if self.token_cache else None,
+                "compression_threshold": self.compression_threshold,
+                "hedge_percentile": self.hedge_percentile,
+                "hedge_min_delay": self.hedge_min_delay,
+                "hedge_max_extra_load": self.hedge_max_extra_load,
+            }
+            if self.share_client:
+                self._client = HorizonClientPool.acquire(**client_options)  # noqa: WPS601
+                self._client_shared = True  # noqa: WPS601
+            else:
+                self._client = HorizonClient(**client_options)  # noqa: WPS601
         return self._client
 
+    @_operation
     def get_hwm(self, name: str) -> Optional[HWM]:
+        cached_hwm = self._get_cached_hwm(name)
+        if cached_hwm:
+            return cached_hwm
+
+        prefetched = self._pop_prefetched(name)
+        if prefetched:
+            try:
+                return self._get_prefetched_hwm(name, prefetched)
+            except OperationTimeoutError:
+                raise
+            except Exception:
+                log.debug("|%s| Prefetching HWM %r failed, fetching it again", self.__class__.__name__, name)
+
+        try:
+            with self._circuit():
+                result = self._read_hwm(name)
+        except Exception as e:
+            if not self._is_unavailable(e):
+                raise
+
+            local_hwm = self._get_local_hwm(name, check_ttl=False)
+            if local_hwm is None:
+                raise
+
+            log.warning(
+                "|%s| Horizon is unavailable, using last known value of HWM %r from local cache",
+                self.__class__.__name__,
+                name,
+            )
+            return local_hwm
+
+        self._replay_pending()
+        return result
+
+    @_operation
+    def get_hwms(self, names: Iterable[str]) -> Dict[str, Optional[HWM]]:
+        """
+        Get multiple HWMs by their names, using as few requests as possible.
+
+        If there are less pages of HWMs in the namespace than requested names, HWMs are searched
+        by paginating over the entire namespace. Otherwise each HWM is fetched by its name.
+        Requests are sent concurrently, using up to ``max_workers`` threads.
+
+        In tiered mode, if Horizon is unavailable, last known values are returned from local cache,
+        like in ``get_hwm``.
+
+        Parameters
+        ----------
+        names : Iterable[str]
+            HWM unique names
+
+        Returns
+        -------
+        Dict[str, Optional[HWM]]
+            Mapping ``name -> HWM``. If HWM does not exist in the store, value is ``None``.
+
+        Examples
+        --------
+
+        .. code:: python
+
+            hwms = hwm_store.get_hwms(["hwm1", "hwm2"])
+            hwm1 = hwms["hwm1"]
+        """
+        names = list(names)
+        cached_hwms = {name: self._get_cached_hwm(name) for name in names}
+        names = [name for name, cached_hwm in cached_hwms.items() if cached_hwm is None]
+        if not names:
+            return cached_hwms
+
+        try:
+            with self._circuit():
+                namespace_id = self._get_namespace_id()
+                hwms = self._find_hwms(namespace_id, names)
+
+                without_value = [hwm.id for hwm in hwms.values() if hwm and not self._has_value(hwm)]
+                full_hwms = {hwm.id: hwm for hwm in self._run_concurrently(self.client.get_hwm, without_value)}
+        except Exception as e:
+            if not self._is_unavailable(e):
+                raise
+
+            local_hwms = {name: self._get_local_hwm(name, check_ttl=False) for name in names}
+            if None in local_hwms.values():
+                raise
+
+            log.warning(
+                "|%s| Horizon is unavailable, using last known values of HWMs %r from local cache",
+                self.__class__.__name__,
+                names,
+            )
+            return {name: cached_hwm or local_hwms[name] for name, cached_hwm in cached_hwms.items()}
+
+        result: Dict[str, Optional[HWM]] = {}
+        for name, cached_hwm in cached_hwms.items():
+            hwm = hwms.get(name)
+            if cached_hwm:
+                result[name] = cached_hwm
+            elif hwm:
+                result[name] = self._build_hwm(namespace_id, full_hwms.get(hwm.id, hwm))
+                self._set_session_hwm(result[name])  # type: ignore[arg-type]
+            else:
+                result[name] = None
+
+        self._replay_pending()
+        return result
+
+    def iter_hwms(self, prefix: Optional[str] = None, page_size: int = MAX_PAGE_SIZE) -> Iterator[HWM]:
+        """
+        Iterate over all HWMs in the namespace, sorted by name.
+
+        HWMs are fetched page by page. While the caller processes HWMs of the current page,
+        the next page is fetched in background thread, and only these two pages are held in memory,
+        so namespaces with any number of HWMs can be iterated.
+
+        .. note::
+
+            Iteration is not a snapshot. If HWMs are created or deleted while iterating,
+            some of them may be skipped or returned twice. Pending writes of ``write_behind`` mode
+            are not included, call :obj:`flush` before iterating to see them.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            If set, only HWMs with names starting with this prefix are returned.
+            Horizon API does not support filtering by prefix, so all HWMs are still fetched.
+
+        page_size : int, default: ``50``
+            Number of HWMs fetched by one request. Should be in range ``1..50``.
+
+        Returns
+        -------
+        Iterator[HWM]
+            HWM objects, created only when the next item is requested.
+
+        Examples
+        --------
+
+        .. code:: python
+
+            for hwm in hwm_store.iter_hwms(prefix="kafka_"):
+                print(hwm.name, hwm.value)
+        """
+        self._check_page_size(page_size)
         namespace_id = self._get_namespace_id()
-        hwm_id = self._get_hwm_id(namespace_id, name)
-        if hwm_id is None:
-            return None
+        return self._iter_hwms(namespace_id, prefix or "", page_size)
+
+    def iter_hwm_history(
+        self,
+        name: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> Iterator[HWM]:
+        """
+        Iterate over changes of HWM, from the newest to the oldest one.
+
+        History is fetched page by page, and the next page is fetched in background thread
+        while the caller processes the current one. Horizon returns history sorted by change time,
+        so if ``since`` is set, iteration stops at the first change older than ``since``,
+        without fetching the rest of history.
+
+        .. note::
 
-        hwm = self.client.get_hwm(hwm_id)
-        hwm_data = hwm.dict(exclude={"id", "namespace_id", "changed_by", "changed_at"})
-        hwm_data["modified_time"] = hwm.changed_at
-        return HWMTypeRegistry.parse(hwm_data)
+            History of HWM saved with ``delta_writes=True`` contains only references to segments,
+            not HWM values, so such items are skipped.
 
+        Parameters
+        ----------
+        name : str
+            HWM unique name
+
+        since : datetime, optional
+            If set, only changes made at this time or later are returned.
+            Naive datetime is treated as local time.
+
+        until : datetime, optional
+            If set, only changes made at this time or earlier are returned.
+            Naive datetime is treated as local time.
+
+        page_size : int, default: ``50``
+            Number of history items fetched by one request. Should be in range ``1..50``.
+
+        Returns
+        -------
+        Iterator[HWM]
+            HWM values, with ``modified_time`` set to time of change.
+            If HWM does not exist in the store, iterator is empty.
+
+        Examples
+        --------
+
+        .. code:: python
+
+            from datetime import datetime, timedelta
+
+            for hwm in hwm_store.iter_hwm_history("some_hwm", since=datetime.now() - timedelta(days=1)):
+                print(hwm.modified_time, hwm.value)
+        """
+        self._check_page_size(page_size)
+        namespace_id = self._get_namespace_id()
+
+        # cached HWM id could be stale, and history of deleted HWM is not what user expects
+        hwm = self._find_hwm(namespace_id, name)
+        if hwm is None:
+            return iter(())
+
+        return self._iter_hwm_history(
+            hwm.id,
+            since=since.astimezone() if since else None,
+            until=until.astimezone() if until else None,
+            page_size=page_size,
+        )
+
+    @_operation
     def set_hwm(self, hwm: HWM) -> str:
+        if self.write_behind:
+            return self._buffer_hwm(self._get_namespace_id(), hwm)
+
+        # changes queued while Horizon was unavailable should be sent before newer ones
+        self._replay_pending()
+        if self._circuit_breaker and self._pending_hwms:
+            return self._buffer_hwm(self._namespace_id, hwm)
+
+        try:
+            with self._circuit():
+                namespace_id = self._get_namespace_id()
+                # HWM id is not resolved using server, create/update request is sent optimistically
+                hwm_id = self._get_cached_hwm_id(namespace_id, hwm.name)  # type: ignore[arg-type]
+                return self._save_hwm(namespace_id, hwm, hwm_id)
+        except Exception as e:
+            if not self._is_unavailable(e):
+                raise
+
+            log.warning(
+                "|%s| Horizon is unavailable, HWM %r is queued to be sent later",
+                self.__class__.__name__,
+                hwm.name,
+            )
+            return self._buffer_hwm(self._namespace_id, hwm)
+
+    @_operation
+    def set_hwms(self, hwms: Iterable[HWM]) -> Dict[str, Union[str, Exception]]:
+        """
+        Save multiple HWMs to the store.
+
+        HWMs are created/updated concurrently, using up to ``max_workers`` threads. Like in ``set_hwm``,
+        HWM ids are not resolved before sending requests. Failure of one HWM (including failure to resolve its id)
+        does not cancel saving other ones.
+
+        In ``write_behind`` mode, or while changes queued in tiered mode are not sent yet,
+        HWMs are buffered like in ``set_hwm``, so they are not overwritten by older buffered values.
+        In tiered mode, HWMs which cannot be saved because Horizon is unavailable are queued as well.
+
+        Parameters
+        ----------
+        hwms : Iterable[HWM]
+            HWM objects. If there are multiple HWMs with the same name, only the last one is saved.
+
+        Returns
+        -------
+        Dict[str, Union[str, Exception]]
+            Mapping ``name -> HWM URL``, or ``name -> exception`` if HWM cannot be saved.
+
+        Examples
+        --------
+
+        .. code:: python
+
+            results = hwm_store.set_hwms([hwm1, hwm2])
+            failed = {name: result for name, result in results.items() if isinstance(result, Exception)}
+        """
+        hwms_by_name: Dict[str, HWM] = {hwm.name: hwm for hwm in hwms}  # type: ignore[misc]
+        if self.write_behind:
+            namespace_id = self._get_namespace_id()
+            return {name: self._buffer_hwm(namespace_id, hwm) for name, hwm in hwms_by_name.items()}
+
+        # changes queued while Horizon was unavailable should be sent before newer ones
+        self._replay_pending()
+        if self._circuit_breaker and self._pending_hwms:
+            return {name: self._buffer_hwm(self._namespace_id, hwm) for name, hwm in hwms_by_name.items()}
+
+        try:
+            results = self._save_hwms_in_circuit(hwms_by_name)
+        except Exception as e:
+            if not self._is_unavailable(e):
+                raise
+            results = {name: e for name in hwms_by_name}
+
+        unavailable = [
+            name for name, result in results.items() if isinstance(result, Exception) and self._is_unavailable(result)
+        ]
+        if unavailable:
+            log.warning(
+                "|%s| Horizon is unavailable, HWMs %r are queued to be sent later",
+                self.__class__.__name__,
+                unavailable,
+            )
+            for name in unavailable:
+                results[name] = self._buffer_hwm(self._namespace_id, hwms_by_name[name])
+        return results
+
+    @_operation
+    def flush(self) -> Dict[str, Union[str, Exception]]:
+        """
+        Send HWMs buffered in ``write_behind`` mode to the server.
+
+        HWMs are saved concurrently, like in ``set_hwms``. HWMs which failed to save are kept buffered
+        (and in journal, if any), so ``flush`` can be called again later.
+
+        Returns
+        -------
+        Dict[str, Union[str, Exception]]
+            Mapping ``name -> HWM URL``, or ``name -> exception`` if HWM cannot be saved.
+        """
+        with self._pending_lock:
+            pending_hwms = dict(self._pending_hwms)
+
+        if not pending_hwms:
+            return {}
+
+        log.debug("|%s| Flushing %d pending HWMs", self.__class__.__name__, len(pending_hwms))
+        results = self._save_hwms_in_circuit(pending_hwms)
+
+        with self._pending_lock:
+            for name, result in results.items():
+                # HWM could be changed while flushing, keep the newer one
+                if not isinstance(result, Exception) and self._pending_hwms.get(name) is pending_hwms[name]:
+                    del self._pending_hwms[name]
+
+            if self._journal:
+                self._journal.rewrite(hwm.serialize() for hwm in self._pending_hwms.values())
+            if not self._pending_hwms:
+                atexit.unregister(self._flush_at_exit)
+                self._pending_since = None  # noqa: WPS601
+
+        return results
+
+    def export_namespace(self, path: Union[str, os.PathLike], prefix: Optional[str] = None) -> int:
+        """
+        Save all HWMs of the namespace to a local file.
+
+        File has JSONL format, with one serialized HWM per line. HWMs are read by :obj:`iter_hwms`,
+        and written to file one by one, so memory usage does not depend on number of HWMs.
+        File is written to a temporary path first, and renamed only after all HWMs were saved.
+
+        Parameters
+        ----------
+        path : str or :obj:`pathlib.Path`
+            Path to export file. Parent directories are created automatically. Existing file is replaced.
+
+        prefix : str, optional
+            If set, only HWMs with names starting with this prefix are exported.
+
+        Returns
+        -------
+        int
+            Number of exported HWMs.
+
+        Examples
+        --------
+
+        .. code:: python
+
+            hwm_store.export_namespace("/backup/namespace.jsonl")
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        exported = 0
+        try:
+            with tmp_path.open("w", encoding="utf-8") as file:
+                for hwm in self.iter_hwms(prefix=prefix):
+                    file.write(json.dumps(hwm.serialize()) + "\n")
+                    exported += 1
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        log.info("|%s| Exported %d HWMs to %s", self.__class__.__name__, exported, path)
+        return exported
+
+    def import_namespace(
+        self,
+        path: Union[str, os.PathLike],
+        batch_size: int = 1000,
+        checkpoint_path: Union[str, os.PathLike, None] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Save all HWMs from a file created by :obj:`export_namespace` to the namespace.
+
+        File is read in batches of ``batch_size`` HWMs. HWMs of each batch are created/updated concurrently,
+        using up to ``max_workers`` threads. HWMs are created without checking if they already exist,
+        so importing into empty namespace requires just one request per HWM.
+
+        After each batch, position in the file is saved to checkpoint file. If import fails,
+        calling this method again continues from the first batch which was not imported.
+        Checkpoint is removed after all HWMs were imported.
+
+        Parameters
+        ----------
+        path : str or :obj:`pathlib.Path`
+            Path to import file.
+
+        batch_size : int, default: ``1000``
+            Max number of HWMs kept in memory and saved concurrently.
+
+        checkpoint_path : str or :obj:`pathlib.Path`, optional
+            Path to checkpoint file. Default is ``path`` with ``.checkpoint`` suffix.
+
+        progress : Callable[[int], None], optional
+            Called after each batch with total number of imported HWMs, including ones imported
+            by previous calls resumed from checkpoint.
+
+        Returns
+        -------
+        int
+            Total number of imported HWMs.
+
+        Raises
+        ------
+        RuntimeError
+            If some HWMs of the batch cannot be saved. Checkpoint points to the beginning of this batch.
+
+        ValueError
+            If file contains malformed lines.
+
+        Examples
+        --------
+
+        .. code:: python
+
+            hwm_store.force_create_namespace()
+            hwm_store.import_namespace(
+                "/backup/namespace.jsonl",
+                progress=lambda imported: print(f"Imported {imported} HWMs"),
+            )
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size should be positive, got {batch_size}")
+
+        path = Path(path)
+        checkpoint = ImportCheckpoint(
+            Path(checkpoint_path) if checkpoint_path else path.with_name(path.name + ".checkpoint"),
+            source=path,
+        )
+        position = checkpoint.read()
+        if position.offset:
+            log.info(
+                "|%s| Resuming import of %s from line %d, %d HWMs were already imported",
+                self.__class__.__name__,
+                path,
+                position.line + 1,
+                position.imported,
+            )
+
         namespace_id = self._get_namespace_id()
 
-        hwm_dict = hwm.serialize()
-        hwm_dict["namespace_id"] = namespace_id
+        def save(hwm: HWM) -> Union[str, Exception]:  # noqa: WPS430
+            try:
+                hwm_id = self._get_cached_hwm_id(namespace_id, hwm.name)  # type: ignore[arg-type]
+                return self._save_hwm(namespace_id, hwm, hwm_id)
+            except Exception as e:
+                return e
+
+        for batch, next_position in self._read_import_batches(path, position, batch_size):
+            # if file contains the same HWM multiple times, the last one wins
+            hwms_by_name: Dict[str, HWM] = {hwm.name: hwm for hwm in batch}  # type: ignore[misc]
+            results = self._run_concurrently(save, hwms_by_name.values())
+            errors = {name: result for name, result in zip(hwms_by_name, results) if isinstance(result, Exception)}
+            if errors:
+                raise RuntimeError(f"Failed to import HWMs {sorted(errors)!r}") from next(iter(errors.values()))
+
+            checkpoint.write(next_position)
+            position = next_position
+            log.info("|%s| Imported %d HWMs from %s", self.__class__.__name__, position.imported, path)
+            if progress:
+                progress(position.imported)
+
+        checkpoint.delete()
+        return position.imported
+
+    def prefetch(self, names: Iterable[str]) -> HorizonHWMStore:
+        """
+        Start fetching HWMs in background, without waiting for the result.
 
-        hwm_id = self._get_hwm_id(namespace_id, hwm.name)  # type: ignore
-        if hwm_id is None:
-            create_request = HWMCreateRequestV1.parse_obj(hwm_dict)
-            response = self.client.create_hwm(create_request)
-        else:
-            update_request = HWMUpdateRequestV1.parse_obj(hwm_dict)
-            response = self.client.update_hwm(hwm_id, update_request)
+        Namespace id, HWM ids and values are fetched concurrently, like in :obj:`get_hwms`.
+        The next :obj:`get_hwm` call for each of these HWMs returns the fetched value (or waits until
+        it is fetched) instead of sending new requests. Each fetched value is used only once,
+        and it is dropped if HWM is saved before ``get_hwm`` call, or on exiting the store context.
+        Values fetched in background never replace values saved after the prefetch was started in store caches.
 
-        # TODO: update response string after implementing UI
-        return f"{self.client.base_url}/v1/hwm/{response.id}"
+        If fetching failed, ``get_hwm`` sends requests as usual.
 
-    def check(self) -> HorizonHWMStore:
+        Parameters
+        ----------
+        names : Iterable[str]
+            HWM unique names
+
+        Returns
+        -------
+        Self
+
+        Examples
+        --------
+
+        .. code:: python
+
+            with hwm_store.prefetch(["hwm1", "hwm2"]):
+                ...  # some other initialization
+                hwm1 = hwm_store.get_hwm("hwm1")  # returned without sending requests
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return self
+
+        written: Set[Optional[str]] = set()
+        with self._prefetch_lock:
+            if not self._prefetch_executor:
+                self._prefetch_executor = ThreadPoolExecutor(  # noqa: WPS601
+                    max_workers=1,
+                    thread_name_prefix=f"{self.__class__.__name__}-prefetch",
+                )
+            self._prefetch_writes.append(written)
+            future = self._prefetch_executor.submit(copy_context().run, self._prefetch_hwms, names, written)
+            for name in names:
+                self._prefetched[name] = future
+
+        log.debug("|%s| Prefetching %d HWMs", self.__class__.__name__, len(names))
+        return self
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Remove HWM from session cache, so the next ``get_hwm`` call will fetch it from the server.
+        See ``session_cache_ttl``.
+
+        Parameters
+        ----------
+        name : str, optional
+            HWM unique name. If not set, all HWMs are removed from session cache.
+        """
+        self._mark_written(name)
+        if name is None:
+            self._session_hwms.clear()
+        else:
+            self._session_hwms.pop(name)
+
+    @_operation
+    def check(self, max_age: Optional[float] = None) -> HorizonHWMStore:
         """
         Perform a health check by making a request to the Horizon server.
 
@@ -206,16 +1152,38 @@ class HorizonHWMStore(BaseHWMStore):
 
         Method also checks whether specified namespace exists, and raises exception if not.
 
+        Parameters
+        ----------
+        max_age : float, optional
+            If set, and the same check (for the same ``api_url``, ``auth`` and ``namespace``)
+            was successfully performed by any store within the process less than ``max_age`` seconds ago,
+            no requests are sent. Useful for frequent liveness probes.
+
         Returns
         -------
         HorizonHWMStore
             Self
 
         """
+        from horizon_hwm_store.client import get_auth_identity
+
+        check_key = (str(self.api_url), get_auth_identity(self.auth), self.namespace)
+        checked_at = _CHECKED_AT.get(check_key)
+        if max_age is not None and checked_at is not None and time.monotonic() - checked_at < max_age:
+            log.debug(
+                "|%s| Check was passed %.1f seconds ago, skipping",
+                self.__class__.__name__,
+                time.monotonic() - checked_at,
+            )
+            return self
+
+        _CHECKED_AT.pop(check_key)
         self.client.whoami()
         self._get_namespace_id()
+        _CHECKED_AT.set(check_key, time.monotonic())
         return self
 
+    @_operation
     def force_create_namespace(self) -> HorizonHWMStore:
         """
         Create a namespace with name specified in HorizonHWMStore class.
@@ -225,37 +1193,84 @@ class HorizonHWMStore(BaseHWMStore):
         HorizonHWMStore
             Self
         """
+        from horizon.commons.schemas.v1 import NamespaceCreateRequestV1
+
         namespace = self._get_namespace(self.namespace)
         if namespace is None:
             try:
                 namespace = self.client.create_namespace(NamespaceCreateRequestV1(name=self.namespace))
-                self._namespace_id = namespace.id  # noqa: WPS601
             except EntityAlreadyExistsError:
                 namespace = cast("NamespaceResponseV1", self._get_namespace(self.namespace))
-                self._namespace_id = namespace.id  # noqa: WPS601
+
+        self._set_namespace_id(namespace.id)
         return self
 
+    def close(self) -> None:
+        """
+        Close HTTP session used by Horizon client.
+
+        If client is shared with other stores, it is closed only after all these stores are closed.
+        Store can still be used after closing, new session will be created on the next request.
+        """
+        if self._client:
+            if self._client_shared:
+                from horizon_hwm_store.client_pool import HorizonClientPool
+
+                HorizonClientPool.release(self._client)
+            else:
+                self._client.close()
+            self._client = None  # noqa: WPS601
+            self._client_shared = False  # noqa: WPS601
+        if self._local_cache:
+            self._local_cache.close()
+        if self._prefetch_executor:
+            self._mark_written(None)
+            self._prefetch_executor.shutdown(wait=False)
+            self._prefetch_executor = None  # noqa: WPS601
+
     # LoginPassword, RetryConfig and TimeoutConfig can be inherited from Pydantic v2 BaseModel
     # which is detected by Pydantic v1 as arbitrary type. So we need to parse them manually.
     @validator("auth", pre=True)
     def _check_auth(cls, value: LoginPassword):
-        if not isinstance(value, LoginPassword):
-            return LoginPassword.parse_obj(value)
+        login_password_class = _import_field_types()["LoginPassword"]
+        if not isinstance(value, login_password_class):
+            return login_password_class.parse_obj(value)
         return value
 
     @validator("retry", pre=True)
     def _check_retry(cls, value: RetryConfig):
-        if not isinstance(value, RetryConfig):
-            return RetryConfig.parse_obj(value)
+        retry_config_class = _import_field_types()["RetryConfig"]
+        if not isinstance(value, retry_config_class):
+            return retry_config_class.parse_obj(value)
         return value
 
     @validator("timeout", pre=True)
     def _check_timeout(cls, value: TimeoutConfig):
-        if not isinstance(value, TimeoutConfig):
-            return TimeoutConfig.parse_obj(value)
+        timeout_config_class = _import_field_types()["TimeoutConfig"]
+        if not isinstance(value, timeout_config_class):
+            return timeout_config_class.parse_obj(value)
+        return value
+
+    @validator("circuit_breaker_threshold")
+    def _check_circuit_breaker_threshold(cls, value: Optional[int], values: dict):
+        if value is None:
+            return value
+
+        missing = [field for field in ("local_cache_path", "write_behind_journal") if not values.get(field)]
+        if missing:
+            raise ValueError(f"Tiered mode requires {' and '.join(missing)} to be set")
         return value
 
+    @classmethod
+    def _resolve_field_types(cls) -> None:
+        """Resolve field annotations which were not imported while creating the class."""
+        if cls not in _RESOLVED_CLASSES:
+            cls.update_forward_refs(**_import_field_types())
+            _RESOLVED_CLASSES.add(cls)
+
     def _get_namespace(self, name: str) -> NamespaceResponseV1 | None:
+        from horizon.commons.schemas.v1 import NamespacePaginateQueryV1
+
         namespaces = self.client.paginate_namespaces(query=NamespacePaginateQueryV1(name=name)).items
         return namespaces[0] if namespaces else None
 
@@ -276,6 +1291,22 @@ class HorizonHWMStore(BaseHWMStore):
         if self._namespace_id is not None:
             return self._namespace_id
 
+        namespace_key = (str(self.api_url), self.namespace)
+        shared_item = _NAMESPACE_IDS.get(namespace_key)
+        if shared_item is not None:
+            cached_at, namespace_id = shared_item
+            if self.namespace_id_cache_ttl is None or time.monotonic() - cached_at < self.namespace_id_cache_ttl:
+                self._namespace_id = namespace_id  # noqa: WPS601
+                return namespace_id
+
+        namespace_id = (
+            self._local_cache.get_namespace_id(max_age=self.namespace_id_cache_ttl) if self._local_cache else None
+        )
+        if namespace_id is not None:
+            self._namespace_id = namespace_id  # noqa: WPS601
+            _NAMESPACE_IDS.set(namespace_key, (time.monotonic(), namespace_id))
+            return namespace_id
+
         namespace = self._get_namespace(self.namespace)
         if namespace is None:
             raise RuntimeError(
@@ -283,10 +1314,28 @@ class HorizonHWMStore(BaseHWMStore):
                 "Please create it before using by calling .force_create_namespace() method.",
             )
 
-        self._namespace_id = namespace.id  # noqa: WPS601
-        return self._namespace_id
+        self._set_namespace_id(namespace.id)
+        return namespace.id
+
+    def _set_namespace_id(self, namespace_id: int) -> None:
+        self._namespace_id = namespace_id  # noqa: WPS601
+        _NAMESPACE_IDS.set((str(self.api_url), self.namespace), (time.monotonic(), namespace_id))
+        if self._local_cache:
+            self._local_cache.set_namespace_id(namespace_id)
+
+    def _forget_namespace_id(self) -> None:
+        log.warning(
+            "|%s| Namespace %r with cached id %r not found, it will be resolved again",
+            self.__class__.__name__,
+            self.namespace,
+            self._namespace_id,
+        )
+        self._namespace_id = None  # noqa: WPS601
+        _NAMESPACE_IDS.pop((str(self.api_url), self.namespace))
+        if self._local_cache:
+            self._local_cache.delete_namespace_id()
 
-    def _get_hwm_id(self, namespace_id: int, hwm_name: str) -> Optional[int]:
+    def _get_hwm_id(self, namespace_id: int, hwm_name: str, use_cache: bool = True) -> Optional[int]:
         """
         Fetch the ID of the HWM within the given namespace.
 
@@ -296,12 +1345,744 @@ class HorizonHWMStore(BaseHWMStore):
             The ID of the namespace.
         hwm_name : str
             The name of the HWM.
+        use_cache : bool, default: ``True``
+            If ``False``, cached value is ignored, and ID is fetched from the server.
 
         Returns
         -------
         Optional[int]
             The ID of the HWM, or None if it does not exist.
         """
+        if use_cache:
+            hwm_id = self._get_cached_hwm_id(namespace_id, hwm_name)
+            if hwm_id is not None:
+                return hwm_id
+
+        hwm = self._find_hwm(namespace_id, hwm_name)
+        return hwm.id if hwm else None
+
+    def _get_cached_hwm_id(self, namespace_id: int, hwm_name: str) -> Optional[int]:
+        """Return HWM ID from in-memory or local cache, without sending any requests."""
+        hwm_id = self._hwm_ids.get((namespace_id, hwm_name))
+        if hwm_id is not None:
+            return hwm_id
+
+        local_entry = self._local_cache.get(hwm_name) if self._local_cache else None
+        if local_entry:
+            self._hwm_ids.set((namespace_id, hwm_name), local_entry.hwm_id)
+            return local_entry.hwm_id
+        return None
+
+    def _read_hwm(self, name: str) -> Optional[HWM]:
+        namespace_id = self._get_namespace_id()
+        hwm = self._find_hwm(namespace_id, name)
+        if hwm is None:
+            return None
+
+        if not self._has_value(hwm):
+            # some servers do not return HWM value in list response
+            hwm = self.client.get_hwm(hwm.id)
+
+        result = self._build_hwm(namespace_id, hwm)
+        self._set_session_hwm(result)
+        return result
+
+    def _find_hwm(self, namespace_id: int, hwm_name: str) -> Optional[HWMResponseV1]:
+        """
+        Fetch the HWM within the given namespace by its name, and cache its ID.
+
+        Parameters
+        ----------
+        namespace_id : int
+            The ID of the namespace.
+        hwm_name : str
+            The name of the HWM.
+
+        Returns
+        -------
+        Optional[HWMResponseV1]
+            The HWM, or None if it does not exist.
+        """
+        from horizon.commons.schemas.v1 import HWMPaginateQueryV1
+
         hwm_query = HWMPaginateQueryV1(namespace_id=namespace_id, name=hwm_name)
         hwms = self.client.paginate_hwm(hwm_query).items
-        return hwms[-1].id if hwms else None
+        if not hwms:
+            self._forget_hwm(namespace_id, hwm_name)
+            return None
+
+        hwm = hwms[-1]
+        self._remember_hwm(namespace_id, hwm)
+        return hwm
+
+    def _buffer_hwm(self, namespace_id: Optional[int], hwm: HWM) -> str:
+        hwm = hwm.copy(deep=True)
+        self._mark_written(hwm.name)
+        with self._pending_lock:
+            if self._journal:
+                self._journal.append(hwm.serialize())
+            if not self._pending_hwms:
+                atexit.register(self._flush_at_exit)
+                self._pending_since = time.time()  # noqa: WPS601
+            self._pending_hwms[hwm.name] = hwm  # type: ignore[index]
+
+        hwm_id = self._hwm_ids.get((namespace_id, hwm.name))  # type: ignore[arg-type]
+        if hwm_id is not None:
+            return self._hwm_url(hwm_id)
+
+        # HWM is not created yet, return URL for searching it by name.
+        # If Horizon was unavailable since the store was created, even namespace id is unknown
+        params = {"namespace_id": namespace_id, "name": hwm.name} if namespace_id is not None else {"name": hwm.name}
+        return f"{self.client.base_url}/v1/hwm/?{urlencode(params)}"
+
+    def _replay_pending(self) -> None:
+        """Send HWM changes queued while Horizon was unavailable, if any."""
+        if not self._circuit_breaker or self.write_behind or not self._pending_hwms:
+            return
+
+        log.info(
+            "|%s| Sending %d HWM changes queued while Horizon was unavailable",
+            self.__class__.__name__,
+            len(self._pending_hwms),
+        )
+        self._flush_pending(raise_errors=False)
+
+    @contextmanager
+    def _circuit(self) -> Iterator[None]:
+        """Fail fast if Horizon is considered unavailable, and pass result of the block to circuit breaker."""
+        if self._circuit_breaker and not self._circuit_breaker.allow_request():
+            raise CircuitBreakerOpenError(
+                f"Horizon is unavailable, next request will be sent after {self.circuit_breaker_reset_timeout}s "
+                "since the last failure",
+            )
+
+        try:
+            yield
+        except Exception as e:
+            self._record_outcome(e)
+            raise
+        self._record_outcome(None)
+
+    def _record_outcome(self, error: Optional[Exception]) -> None:
+        if not self._circuit_breaker:
+            return
+
+        if error is not None and self._is_backend_failure(error):
+            self._circuit_breaker.record_failure()
+        else:
+            self._circuit_breaker.record_success()
+
+    def _is_unavailable(self, error: Exception) -> bool:
+        """Return ``True`` if tiered mode is enabled, and operation failed because Horizon is unavailable."""
+        if not self._circuit_breaker:
+            return False
+        return isinstance(error, CircuitBreakerOpenError) or self._is_backend_failure(error)
+
+    def _get_pending_hwm(self, name: str) -> Optional[HWM]:
+        with self._pending_lock:
+            pending_hwm = self._pending_hwms.get(name)
+            return pending_hwm.copy(deep=True) if pending_hwm else None
+
+    def _flush_pending(self, raise_errors: bool) -> None:
+        results = self.flush()
+        errors = {name: result for name, result in results.items() if isinstance(result, Exception)}
+        if not errors:
+            return
+
+        if self._journal and all(self._is_unavailable(error) for error in errors.values()):
+            log.warning(
+                "|%s| Horizon is unavailable, changes of HWMs %r are kept in journal %s",
+                self.__class__.__name__,
+                sorted(errors),
+                self.write_behind_journal,
+            )
+            return
+
+        if raise_errors:
+            raise RuntimeError(f"Failed to flush HWMs {sorted(errors)!r}") from next(iter(errors.values()))
+
+        for name, error in errors.items():
+            log.error("|%s| Failed to flush HWM %r", self.__class__.__name__, name, exc_info=error)
+
+    def _flush_at_exit(self) -> None:
+        log.info("|%s| Flushing pending HWMs on interpreter exit", self.__class__.__name__)
+        # thread pools cannot be used after interpreter shutdown was started
+        with run_inline():
+            self._flush_pending(raise_errors=False)
+
+    def _load_journal(self) -> None:
+        records = self._journal.read()  # type: ignore[union-attr]
+        if not records:
+            return
+
+        log.warning(
+            "|%s| Found %d unflushed HWM changes in journal %s, they will be flushed on exit",
+            self.__class__.__name__,
+            len(records),
+            self.write_behind_journal,
+        )
+        with self._pending_lock:
+            if not self._pending_hwms:
+                atexit.register(self._flush_at_exit)
+                self._pending_since = time.time()  # noqa: WPS601
+            # journal contains all changes in order, so only the last change of each HWM is kept
+            journal_hwms = {record["name"]: record for record in records}
+            for name, record in journal_hwms.items():
+                # HWMs buffered by this instance are newer than ones in journal
+                if name not in self._pending_hwms:
+                    self._pending_hwms[name] = HWMTypeRegistry.parse(record)
+
+    def _hwm_url(self, hwm_id: int) -> str:
+        # TODO: update response string after implementing UI
+        return f"{self.client.base_url}/v1/hwm/{hwm_id}"
+
+    def _save_hwms(self, hwms_by_name: Dict[str, HWM]) -> Dict[str, Union[str, Exception]]:
+        """Send multiple HWMs to the server, bypassing write-behind buffer."""
+        namespace_id = self._get_namespace_id()
+
+        def save(hwm: HWM) -> Union[str, Exception]:  # noqa: WPS430
+            try:
+                # like in set_hwm, HWM id is not resolved before sending create/update request
+                hwm_id = self._get_cached_hwm_id(namespace_id, hwm.name)  # type: ignore[arg-type]
+                return self._save_hwm(namespace_id, hwm, hwm_id)
+            except Exception as e:
+                return e
+
+        results = self._run_concurrently(save, hwms_by_name.values())
+        return dict(zip(hwms_by_name.keys(), results))
+
+    def _save_hwms_in_circuit(self, hwms_by_name: Dict[str, HWM]) -> Dict[str, Union[str, Exception]]:
+        """Like ``_save_hwms``, but fail fast if Horizon is unavailable, and pass results to circuit breaker."""
+        breaker = self._circuit_breaker
+        if breaker and not breaker.allow_request():
+            return {name: CircuitBreakerOpenError("Horizon is unavailable") for name in hwms_by_name}
+
+        try:
+            results = self._save_hwms(hwms_by_name)
+        except Exception as e:
+            self._record_outcome(e)
+            raise
+
+        errors = (result for result in results.values() if isinstance(result, Exception))
+        self._record_outcome(next((error for error in errors if self._is_backend_failure(error)), None))
+        return results
+
+    def _save_hwm(self, namespace_id: int, hwm: HWM, hwm_id: Optional[int]) -> str:
+        """
+        Create or update HWM within the given namespace.
+
+        If HWM ID is known, HWM is updated, and ID is resolved again only if HWM with this ID does not exist anymore.
+        Otherwise HWM is created, and if it already exists, its ID is resolved and then HWM is updated.
+        So in most cases only one request is sent.
+
+        Parameters
+        ----------
+        namespace_id : int
+            The ID of the namespace.
+        hwm : HWM
+            HWM object.
+        hwm_id : Optional[int]
+            Already resolved ID of the HWM, or None if it is unknown.
+
+        Returns
+        -------
+        str
+            HWM URL.
+        """
+        # value on server is unknown until request succeeds
+        self._session_hwms.pop(hwm.name)  # type: ignore[arg-type]
+        self._mark_written(hwm.name)
+
+        hwm_dict = hwm.serialize()
+        hwm_dict["namespace_id"] = namespace_id
+
+        segments: Optional[List[Segment]] = None
+        if self.delta_writes and hwm_dict["type"] in SEGMENT_CODECS:
+            # segments are written first, and then HWM itself is updated to point to them
+            hwm_dict, segments = self._save_segments(namespace_id, hwm_dict)
+
+        known_hwm = self._known_hwms.get((namespace_id, hwm.name))  # type: ignore[arg-type]
+        if not self.force_writes and known_hwm and known_hwm[1] == self._get_fingerprint(hwm_dict):
+            log.debug("|%s| HWM %r is not changed, skipping", self.__class__.__name__, hwm.name)
+            with self._suppressed_writes_lock:
+                self._suppressed_writes += 1  # noqa: WPS601
+            if segments is not None:
+                self._segments.set((namespace_id, hwm.name), segments)  # type: ignore[arg-type]
+            self._set_session_hwm(hwm)
+            return self._hwm_url(known_hwm[0])
+
+        response = self._send_hwm(namespace_id, hwm_dict, hwm_id)
+        self._remember_hwm(namespace_id, response)
+        if segments is not None:
+            self._segments.set((namespace_id, response.name), segments)
+        self._set_session_hwm(hwm)
+
+        return self._hwm_url(response.id)
+
+    def _send_hwm(self, namespace_id: int, hwm_dict: dict, hwm_id: Optional[int]) -> HWMResponseV1:
+        """Send create or update request for HWM, handling stale or unknown HWM ID."""
+        try:
+            return self._create_or_update_hwm(namespace_id, hwm_dict, hwm_id)
+        except EntityNotFoundError as e:
+            # cached namespace id is stale, e.g. namespace was recreated
+            if e.entity_type == "Namespace":
+                self._forget_namespace_id()
+            raise
+
+    def _create_or_update_hwm(self, namespace_id: int, hwm_dict: dict, hwm_id: Optional[int]) -> HWMResponseV1:
+        from horizon.commons.schemas.v1 import HWMCreateRequestV1, HWMUpdateRequestV1
+
+        hwm_name = hwm_dict["name"]
+        if hwm_id is not None:
+            update_request = HWMUpdateRequestV1.parse_obj(hwm_dict)
+            try:
+                response = self.client.update_hwm(hwm_id, update_request)
+            except EntityNotFoundError:
+                # cached id is stale, resolve it again
+                hwm_id = self._get_hwm_id(namespace_id, hwm_name, use_cache=False)
+                if hwm_id is not None:
+                    response = self.client.update_hwm(hwm_id, update_request)
+
+        if hwm_id is None:
+            create_request = HWMCreateRequestV1.parse_obj(hwm_dict)
+            try:
+                response = self.client.create_hwm(create_request)
+            except EntityAlreadyExistsError:
+                # HWM was created before, or concurrently by another process
+                hwm_id = self._get_hwm_id(namespace_id, hwm_name, use_cache=False)
+                if hwm_id is None:
+                    raise
+                response = self.client.update_hwm(hwm_id, HWMUpdateRequestV1.parse_obj(hwm_dict))
+
+        return response
+
+    def _save_segments(self, namespace_id: int, hwm_dict: dict) -> Tuple[dict, List[Segment]]:
+        """
+        Save part of HWM value changed since the previous write as a new segment, and merge segments if needed.
+
+        Returns
+        -------
+        Tuple[dict, List[Segment]]
+            Content of HWM head record, and new list of segments.
+        """
+        hwm_name = hwm_dict["name"]
+        # if saving head record fails, it is unknown which segments are used, so they should be read again
+        segments = self._segments.pop((namespace_id, hwm_name))
+        if segments is None:
+            segments = self._load_segments(namespace_id, hwm_name, hwm_dict["type"])
+
+        codec = SEGMENT_CODECS[hwm_dict["type"]]
+        new_segment, segments = plan_segments(codec, segments, codec.decode(hwm_dict["value"]), self.max_segments)
+        if new_segment:
+            log.debug(
+                "|%s| Saving %d items of HWM %r to segment %d",
+                self.__class__.__name__,
+                len(new_segment.value),
+                hwm_name,
+                new_segment.slot,
+            )
+            segment_name = get_segment_name(hwm_name, new_segment.slot)
+            segment_dict = {
+                **hwm_dict,
+                "name": segment_name,
+                "description": f"Segment of HWM {hwm_name!r}",
+                "value": codec.encode(new_segment.value),
+            }
+            response = self._send_hwm(namespace_id, segment_dict, self._hwm_ids.get((namespace_id, segment_name)))
+            self._hwm_ids.set((namespace_id, segment_name), response.id)
+
+        head_dict = {
+            **hwm_dict,
+            "type": get_segmented_type(hwm_dict["type"]),
+            "value": {"segments": [segment.slot for segment in segments]},
+        }
+        return head_dict, segments
+
+    def _load_segments(self, namespace_id: int, hwm_name: str, hwm_type: str) -> List[Segment]:
+        """Read segments of HWM from server. Returns empty list if HWM does not exist, or it is not segmented."""
+        head = self._find_hwm(namespace_id, hwm_name)
+        if head is not None and not self._has_value(head):
+            head = self.client.get_hwm(head.id)
+
+        if head is None or not is_segmented_type(head.type) or get_base_type(head.type) != hwm_type:
+            return []
+        return self._read_segments(namespace_id, head)
+
+    def _read_segments(self, namespace_id: int, head: HWMResponseV1) -> List[Segment]:
+        from horizon.commons.schemas.v1 import HWMPaginateQueryV1
+
+        slots: List[int] = head.value["segments"]
+        segment_names = [get_segment_name(head.name, slot) for slot in slots]
+
+        def fetch_segment(segment_name: str) -> HWMResponseV1:  # noqa: WPS430
+            query = HWMPaginateQueryV1(namespace_id=namespace_id, name=segment_name)
+            items = self.client.paginate_hwm(query=query).items
+            if not items:
+                raise RuntimeError(f"Segment {segment_name!r} of HWM {head.name!r} not found")
+            segment = items[0]
+            with self._updating_cache(head.name) as allowed:
+                if allowed:
+                    self._hwm_ids.set((namespace_id, segment_name), segment.id)
+            return segment if self._has_value(segment) else self.client.get_hwm(segment.id)
+
+        codec = SEGMENT_CODECS[get_base_type(head.type)]
+        responses = self._run_concurrently(fetch_segment, segment_names)
+        segments = [Segment(slot=slot, value=codec.decode(response.value)) for slot, response in zip(slots, responses)]
+        with self._updating_cache(head.name) as allowed:
+            if allowed:
+                self._segments.set((namespace_id, head.name), segments)
+        return segments
+
+    def _find_hwms(self, namespace_id: int, hwm_names: Iterable[str]) -> Dict[str, Optional[HWMResponseV1]]:
+        """
+        Fetch multiple HWMs within the given namespace by their names, and cache their IDs.
+
+        Parameters
+        ----------
+        namespace_id : int
+            The ID of the namespace.
+        hwm_names : Iterable[str]
+            The names of the HWMs.
+
+        Returns
+        -------
+        Dict[str, Optional[HWMResponseV1]]
+            Mapping ``name -> HWM``, or ``name -> None`` if HWM does not exist.
+        """
+        from horizon.commons.schemas.v1 import HWMPaginateQueryV1
+
+        result: Dict[str, Optional[HWMResponseV1]] = dict.fromkeys(hwm_names)
+        if len(result) <= 1:
+            return {name: self._find_hwm(namespace_id, name) for name in result}
+
+        first_page = self.client.paginate_hwm(
+            HWMPaginateQueryV1(namespace_id=namespace_id, page=1, page_size=MAX_PAGE_SIZE),
+        )
+        pages = [first_page]
+        found_names = {hwm.name for hwm in first_page.items if hwm.name in result}
+        not_found_names = [name for name in result if name not in found_names]
+
+        scan_namespace = first_page.meta.pages_count - 1 <= len(not_found_names)
+        if scan_namespace and first_page.meta.has_next:
+            pages.extend(
+                self._run_concurrently(
+                    lambda page: self.client.paginate_hwm(
+                        HWMPaginateQueryV1(namespace_id=namespace_id, page=page, page_size=MAX_PAGE_SIZE),
+                    ),
+                    range(2, first_page.meta.pages_count + 1),
+                ),
+            )
+
+        for page in pages:
+            for hwm in page.items:
+                if hwm.name in result:
+                    result[hwm.name] = hwm
+                    self._remember_hwm(namespace_id, hwm)
+
+        # HWMs could be moved between pages if some were deleted while paginating, so missing ones should be checked
+        namespace_changed = any(page.meta.total_count != first_page.meta.total_count for page in pages)
+        if not scan_namespace or namespace_changed:
+            not_found_names = [name for name, hwm in result.items() if hwm is None]
+            found_hwms = self._run_concurrently(lambda name: self._find_hwm(namespace_id, name), not_found_names)
+            result.update(zip(not_found_names, found_hwms))
+        else:
+            for name, found_hwm in result.items():
+                if found_hwm is None:
+                    self._forget_hwm(namespace_id, name)
+
+        return result
+
+    def _iter_hwms(self, namespace_id: int, prefix: str, page_size: int) -> Iterator[HWM]:
+        from horizon.commons.schemas.v1 import HWMPaginateQueryV1
+
+        def fetch_page(page: int):
+            query = HWMPaginateQueryV1(namespace_id=namespace_id, page=page, page_size=page_size)
+            return self.client.paginate_hwm(query)
+
+        with closing(self._iter_pages(fetch_page)) as pages:
+            for items in pages:
+                for hwm in items:
+                    if not hwm.name.startswith(prefix) or is_segment_name(hwm.name):
+                        continue
+
+                    if not self._has_value(hwm):
+                        hwm = self.client.get_hwm(hwm.id)
+                    self._remember_hwm(namespace_id, hwm)
+                    yield self._build_hwm(namespace_id, hwm)
+
+    def _iter_hwm_history(
+        self,
+        hwm_id: int,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        page_size: int,
+    ) -> Iterator[HWM]:
+        from horizon.commons.schemas.v1 import HWMHistoryPaginateQueryV1
+
+        def fetch_page(page: int):
+            query = HWMHistoryPaginateQueryV1(hwm_id=hwm_id, page=page, page_size=page_size)
+            return self.client.paginate_hwm_history(query)
+
+        # Horizon returns history items from the newest to the oldest one
+        with closing(self._iter_pages(fetch_page)) as pages:
+            for items in pages:
+                for item in items:
+                    if until and item.changed_at > until:
+                        continue
+                    if since and item.changed_at < since:
+                        return
+
+                    if is_segmented_type(item.type):
+                        log.warning(
+                            "|%s| HWM %r was stored by delta writes at %s, skipping history item",
+                            self.__class__.__name__,
+                            item.name,
+                            item.changed_at.isoformat(),
+                        )
+                        continue
+                    yield self._parse_hwm(item)
+
+    def _iter_pages(self, fetch_page: Callable[[int], PageResponseV1]) -> Iterator[list]:
+        """Yield items of each page, while the next page is fetched in background thread."""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.__class__.__name__)
+        next_page = executor.submit(fetch_page, 1)
+        try:
+            while next_page:
+                current_page = next_page.result()
+                next_page = None
+                if current_page.meta.has_next:
+                    next_page = executor.submit(fetch_page, current_page.meta.next_page)
+                yield current_page.items
+        finally:
+            # generator can be abandoned by caller at any moment. Request of the next page is usually
+            # already running and cannot be cancelled, so its result is dropped instead of waiting for it
+            if next_page:
+                next_page.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _read_import_batches(
+        path: Path,
+        position: ImportPosition,
+        batch_size: int,
+    ) -> Iterator[Tuple[List[HWM], ImportPosition]]:
+        """Yield batches of HWMs read from the file, and position of the next batch."""
+        offset, line_number, imported = position
+        batch: List[HWM] = []
+        with path.open("rb") as file:
+            file.seek(offset)
+            for line in file:
+                offset += len(line)
+                line_number += 1
+                if not line.strip():
+                    continue
+
+                try:
+                    batch.append(HWMTypeRegistry.parse(json.loads(line)))
+                except (ValueError, KeyError) as e:
+                    raise ValueError(f"Malformed HWM at line {line_number} of {path}") from e
+
+                if len(batch) >= batch_size:
+                    imported += len(batch)
+                    yield batch, ImportPosition(offset=offset, line=line_number, imported=imported)
+                    batch = []
+
+        if batch:
+            imported += len(batch)
+            yield batch, ImportPosition(offset=offset, line=line_number, imported=imported)
+
+    def _remember_hwm(self, namespace_id: int, hwm: HWMResponseV1) -> None:
+        with self._updating_cache(hwm.name) as allowed:
+            if not allowed:
+                return
+
+            self._hwm_ids.set((namespace_id, hwm.name), hwm.id)
+            if not self._has_value(hwm):
+                return
+
+            hwm_fields = {field: getattr(hwm, field) for field in HWM_FIELDS}
+            self._known_hwms.set((namespace_id, hwm.name), (hwm.id, self._get_fingerprint(hwm_fields)))
+            if self._local_cache:
+                self._local_cache.set(hwm.name, hwm.id, json.loads(hwm.json()))
+
+    def _forget_hwm(self, namespace_id: int, hwm_name: str) -> None:
+        with self._updating_cache(hwm_name) as allowed:
+            if not allowed:
+                return
+
+            self._hwm_ids.pop((namespace_id, hwm_name))
+            self._known_hwms.pop((namespace_id, hwm_name))
+            if self._local_cache:
+                self._local_cache.delete(hwm_name)
+
+    def _build_hwm(self, namespace_id: int, hwm: HWMResponseV1) -> HWM:
+        """Convert server response to HWM object. If HWM is segmented, all its segments are read and merged."""
+        if not is_segmented_type(hwm.type):
+            return self._parse_hwm(hwm)
+
+        hwm_type = get_base_type(hwm.type)
+        segments = self._read_segments(namespace_id, hwm)
+        value = SEGMENT_CODECS[hwm_type].merge(segment.value for segment in segments)
+        head = hwm.copy(update={"type": hwm_type, "value": None})
+        return self._parse_hwm(head, value)
+
+    def _get_cached_hwm(self, name: str) -> Optional[HWM]:
+        return self._get_pending_hwm(name) or self._get_session_hwm(name) or self._get_local_hwm(name)
+
+    @staticmethod
+    def _get_prefetched_hwm(name: str, prefetched: Future) -> Optional[HWM]:
+        try:
+            hwms = prefetched.result(timeout=get_remaining_time())
+        except FutureTimeoutError as e:
+            raise OperationTimeoutError(f"Operation timeout exceeded while waiting for HWM {name!r}") from e
+        hwm = hwms.get(name)
+        return hwm.copy(deep=True) if hwm else None
+
+    def _prefetch_hwms(self, names: List[str], written: Set[Optional[str]]) -> Dict[str, Optional[HWM]]:
+        """Fetch HWMs in background thread, without caching ones which were written meanwhile."""
+        # called within a copy of caller context, and this context is passed to worker threads of get_hwms
+        _PREFETCH_WRITES.set(written)
+        try:
+            return self.get_hwms(names)
+        finally:
+            with self._prefetch_lock:
+                self._prefetch_writes = [item for item in self._prefetch_writes if item is not written]  # noqa: WPS601
+
+    def _pop_prefetched(self, name: str) -> Optional[Future]:
+        with self._prefetch_lock:
+            return self._prefetched.pop(name, None)
+
+    def _mark_written(self, name: Optional[str]) -> None:
+        """
+        Drop prefetched HWM, and prevent running prefetch from caching value older than the one being written.
+        ``None`` means all HWMs.
+        """
+        with self._prefetch_lock:
+            if name is None:
+                for future in self._prefetched.values():
+                    future.cancel()
+                self._prefetched.clear()
+            else:
+                self._prefetched.pop(name, None)
+
+            for written in self._prefetch_writes:
+                written.add(name)
+
+    @contextmanager
+    def _updating_cache(self, name: str) -> Iterator[bool]:
+        """Yield ``False`` if called by background prefetch, and HWM was written since prefetch was started."""
+        written = _PREFETCH_WRITES.get()
+        if written is None:
+            yield True
+            return
+
+        # HWM cannot be written between the check and updating the cache
+        with self._prefetch_lock:
+            yield name not in written and None not in written
+
+    def _get_session_hwm(self, name: str) -> Optional[HWM]:
+        session_hwm = self._session_hwms.get(name)
+        return session_hwm.copy(deep=True) if session_hwm else None
+
+    def _set_session_hwm(self, hwm: HWM) -> None:
+        if self._context_depth <= 0:
+            return
+
+        with self._updating_cache(hwm.name) as allowed:  # type: ignore[arg-type]
+            if allowed:
+                self._session_hwms.set(hwm.name, hwm.copy(deep=True))  # type: ignore[arg-type]
+
+    def _get_local_hwm(self, name: str, check_ttl: bool = True) -> Optional[HWM]:
+        """
+        Return HWM from local cache, if it was validated less than ``local_cache_ttl`` seconds ago.
+        If ``check_ttl=False``, the last known value is returned regardless of its age.
+        """
+        if not self._local_cache or (check_ttl and not self.local_cache_ttl):
+            return None
+
+        local_entry = self._local_cache.get(name)
+        if not local_entry:
+            return None
+
+        if check_ttl and time.time() - local_entry.validated_at > self.local_cache_ttl:  # type: ignore[operator]
+            return None
+
+        if is_segmented_type(local_entry.data["type"]):
+            # only head record is cached, segments should be read from server
+            return None
+
+        from horizon.commons.schemas.v1 import HWMResponseV1
+
+        return self._parse_hwm(HWMResponseV1.parse_obj(local_entry.data))
+
+    def _run_concurrently(
+        self,
+        func: Callable[[InputType], ResultType],
+        items: Iterable[InputType],
+    ) -> List[ResultType]:
+        """Call function for each item using up to ``max_workers`` threads, and return results in the same order."""
+        items = list(items)
+        if len(items) <= 1 or is_inline():
+            return [func(item) for item in items]
+
+        # deadline of the current operation is stored in context, which should be passed to threads explicitly
+        contexts = [copy_context() for _ in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(lambda context, item: context.run(func, item), contexts, items))
+
+    @staticmethod
+    def _check_page_size(page_size: int) -> None:
+        if not 0 < page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size should be in range 1..{MAX_PAGE_SIZE}, got {page_size}")
+
+    @staticmethod
+    def _is_backend_failure(error: Exception) -> bool:
+        """Return ``True`` if request failed because Horizon is unavailable, not because request is invalid."""
+        # requests.HTTPError for responses not converted to Horizon exceptions
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+        if status_code is not None:
+            return status_code >= 500
+
+        # requests.RequestException is a subclass of OSError
+        return isinstance(error, (OSError, ServiceError))
+
+    @staticmethod
+    def _has_value(hwm: HWMResponseV1) -> bool:
+        # Pydantic v1 sets missing value of type Any to None, so check if the field was actually passed
+        fields_set = getattr(hwm, "model_fields_set", None)
+        if fields_set is None:
+            fields_set = hwm.__fields_set__
+        return "value" in fields_set
+
+    @staticmethod
+    def _get_fingerprint(hwm_dict: dict) -> str:
+        """
+        Return hash of HWM fields which can be changed by update request, to compare them with each other.
+
+        Hash is used instead of serialized fields to avoid keeping a copy of large HWM values in memory.
+        """
+        from horizon.commons.schemas.v1 import HWMUpdateRequestV1
+
+        serialized = HWMUpdateRequestV1.parse_obj(hwm_dict).json()
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _parse_hwm(hwm: HWMResponseV1, value: Any = None) -> HWM:
+        """
+        Convert server response to HWM object.
+
+        Unlike ``HWMTypeRegistry.parse(hwm.dict())``, HWM value is not copied before validation,
+        so large values (like ``FileListHWM`` with hundreds of thousands of paths)
+        are not kept in memory multiple times.
+        """
+        hwm_class = HWMTypeRegistry.get(hwm.type)
+        hwm_data = {
+            "name": hwm.name,
+            "description": hwm.description,
+            "entity": hwm.entity,
+            "expression": hwm.expression,
+            "value": hwm.value if value is None else value,
+            "modified_time": hwm.changed_at,
+        }
+        return hwm_class.parse_obj(hwm_data)
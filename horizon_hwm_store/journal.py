@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, List
+
+log = logging.getLogger(__name__)
+
+
+class HWMJournal:
+    """
+    Local append-only file with JSON records, one record per line.
+
+    Each record is flushed and synced to disk before :obj:`append` returns,
+    so records survive process crash or power loss. Partially written last line is ignored while reading.
+
+    Parameters
+    ----------
+    path : :obj:`pathlib.Path`
+        Path to journal file. Parent directories are created automatically.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, record: dict) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def read(self) -> List[dict]:
+        with self._lock:
+            if not self.path.exists():
+                return []
+
+            records = []
+            with self.path.open(encoding="utf-8") as file:
+                for line_number, line in enumerate(file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        log.warning(
+                            "|%s| Skipping malformed line %d of %s", self.__class__.__name__, line_number, self.path
+                        )
+            return records
+
+    def rewrite(self, records: Iterable[dict]) -> None:
+        """Atomically replace journal content with passed records. Empty journal is removed."""
+        lines = [json.dumps(record) + "\n" for record in records]
+        with self._lock:
+            if not lines:
+                if self.path.exists():
+                    self.path.unlink()
+                return
+
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with tmp_path.open("w", encoding="utf-8") as file:
+                file.writelines(lines)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,167 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS namespace (
+    api_url TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    namespace_id INTEGER NOT NULL,
+    cached_at REAL NOT NULL,
+    PRIMARY KEY (api_url, namespace)
+);
+
+CREATE TABLE IF NOT EXISTS hwm (
+    api_url TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    hwm_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    validated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (api_url, namespace, name)
+);
+
+CREATE INDEX IF NOT EXISTS hwm_accessed_at ON hwm (accessed_at);
+"""
+
+
+class LocalCacheEntry(NamedTuple):
+    hwm_id: int
+    """HWM id"""
+
+    data: dict
+    """HWM response content"""
+
+    validated_at: float
+    """Timestamp of the last time entry was received from server"""
+
+
+class LocalHWMCache:
+    """
+    Persistent cache of HWM ids and values, stored in local SQLite database.
+
+    Entries are bound to a specific Horizon instance and namespace, so the same file can be shared
+    between different stores and processes.
+
+    Parameters
+    ----------
+    path : :obj:`pathlib.Path`
+        Path to SQLite database file. Parent directories are created automatically.
+
+    api_url : str
+        Horizon API URL
+
+    namespace : str
+        Namespace name
+
+    max_entries : int
+        Max number of HWMs stored in the file (for all Horizon instances and namespaces).
+        Least recently accessed entries are removed first.
+    """
+
+    def __init__(self, path: Path, api_url: str, namespace: str, max_entries: int) -> None:
+        self.path = Path(path)
+        self.api_url = api_url
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def get_namespace_id(self, max_age: Optional[float] = None) -> Optional[int]:
+        """Return namespace id, if it was cached less than ``max_age`` seconds ago (or at any time, if ``None``)."""
+        rows = self._execute(
+            "SELECT namespace_id, cached_at FROM namespace WHERE api_url = ? AND namespace = ?",
+            (self.api_url, self.namespace),
+        )
+        if not rows:
+            return None
+
+        namespace_id, cached_at = rows[0]
+        if max_age is not None and time.time() - cached_at >= max_age:
+            return None
+        return namespace_id
+
+    def set_namespace_id(self, namespace_id: int) -> None:
+        rows = self._execute(
+            "SELECT namespace_id FROM namespace WHERE api_url = ? AND namespace = ?",
+            (self.api_url, self.namespace),
+        )
+        if rows and rows[0][0] != namespace_id:
+            # namespace was recreated, cached HWMs belong to the old one
+            self._execute("DELETE FROM hwm WHERE api_url = ? AND namespace = ?", (self.api_url, self.namespace))
+
+        self._execute(
+            "INSERT OR REPLACE INTO namespace (api_url, namespace, namespace_id, cached_at) VALUES (?, ?, ?, ?)",
+            (self.api_url, self.namespace, namespace_id, time.time()),
+        )
+
+    def delete_namespace_id(self) -> None:
+        # namespace id is resolved again later, and the new one cannot be compared with the old one,
+        # so cached HWMs are removed together with it
+        self._execute("DELETE FROM hwm WHERE api_url = ? AND namespace = ?", (self.api_url, self.namespace))
+        self._execute(
+            "DELETE FROM namespace WHERE api_url = ? AND namespace = ?",
+            (self.api_url, self.namespace),
+        )
+
+    def get(self, name: str) -> Optional[LocalCacheEntry]:
+        key = (self.api_url, self.namespace, name)
+        rows = self._execute(
+            "SELECT hwm_id, data, validated_at FROM hwm WHERE api_url = ? AND namespace = ? AND name = ?",
+            key,
+        )
+        if not rows:
+            return None
+
+        self._execute(
+            "UPDATE hwm SET accessed_at = ? WHERE api_url = ? AND namespace = ? AND name = ?",
+            (time.time(), *key),
+        )
+        hwm_id, data, validated_at = rows[0]
+        return LocalCacheEntry(hwm_id=hwm_id, data=json.loads(data), validated_at=validated_at)
+
+    def set(self, name: str, hwm_id: int, data: dict) -> None:
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO hwm "
+            "(api_url, namespace, name, hwm_id, data, changed_at, validated_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.api_url, self.namespace, name, hwm_id, json.dumps(data), data["changed_at"], now, now),
+        )
+        self._execute(
+            "DELETE FROM hwm WHERE rowid IN (SELECT rowid FROM hwm ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def delete(self, name: str) -> None:
+        self._execute(
+            "DELETE FROM hwm WHERE api_url = ? AND namespace = ? AND name = ?",
+            (self.api_url, self.namespace, name),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+    def _execute(self, query: str, params: tuple) -> List[tuple]:
+        with self._lock:
+            if not self._connection:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # connection is guarded by lock, so it can be used by different threads
+                self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+                self._connection.isolation_level = None  # autocommit
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.executescript(SCHEMA)
+
+            return self._connection.execute(query, params).fetchall()
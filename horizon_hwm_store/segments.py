@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import itertools
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+# head record of segmented HWM has type like "file_list_segmented"
+SEGMENTED_TYPE_SUFFIX = "_segmented"
+SEGMENT_NAME_PATTERN = re.compile(r"#segment-\d+$")
+
+
+class Segment(NamedTuple):
+    slot: int
+    """Segment number, used to build segment record name"""
+
+    value: Any
+    """Part of HWM value stored in this segment, in format returned by :obj:`SegmentCodec.decode`"""
+
+
+class SegmentCodec(ABC):
+    """Describes how value of specific HWM type is split into segments, and how segments are merged back."""
+
+    @abstractmethod
+    def decode(self, value: Any) -> Any:
+        """Convert HWM value (serialized to JSON) to segment value"""
+
+    @abstractmethod
+    def encode(self, value: Any) -> Any:
+        """Convert segment value to HWM value which can be serialized to JSON"""
+
+    @abstractmethod
+    def merge(self, values: Iterable[Any]) -> Any:
+        """Merge segment values, from the oldest to the newest one"""
+
+    @abstractmethod
+    def diff(self, old: Any, new: Any) -> Tuple[Any, bool]:
+        """
+        Return part of ``new`` value which is not present in ``old`` one,
+        and ``True`` if ``new`` cannot be represented as ``merge([old, diff])``.
+        """
+
+
+class FileListCodec(SegmentCodec):
+    """Each segment contains paths added since the previous one."""
+
+    def decode(self, value: Iterable[str]) -> FrozenSet[str]:
+        return frozenset(value)
+
+    def encode(self, value: FrozenSet[str]) -> List[str]:
+        return sorted(value)
+
+    def merge(self, values: Iterable[FrozenSet[str]]) -> FrozenSet[str]:
+        return frozenset().union(*values)
+
+    def diff(self, old: FrozenSet[str], new: FrozenSet[str]) -> Tuple[FrozenSet[str], bool]:
+        return new - old, not old <= new
+
+
+class KeyValueIntCodec(SegmentCodec):
+    """
+    Each segment contains keys (e.g. Kafka partitions) changed since the previous one.
+    Newer segments override values of older ones.
+    """
+
+    def decode(self, value: Dict[Any, int]) -> Dict[str, int]:
+        # JSON object keys are always strings
+        return {str(key): offset for key, offset in value.items()}
+
+    def encode(self, value: Dict[str, int]) -> Dict[str, int]:
+        return value
+
+    def merge(self, values: Iterable[Dict[str, int]]) -> Dict[str, int]:
+        result: Dict[str, int] = {}
+        for value in values:
+            result.update(value)
+        return result
+
+    def diff(self, old: Dict[str, int], new: Dict[str, int]) -> Tuple[Dict[str, int], bool]:
+        changed = {key: offset for key, offset in new.items() if old.get(key) != offset}
+        # removed keys or decreased values cannot be represented as overlay,
+        # and also merging segments should never move offsets back
+        requires_compaction = any(key not in new or new[key] < offset for key, offset in old.items())
+        return changed, requires_compaction
+
+
+# HWM types which can be stored as multiple segments
+SEGMENT_CODECS: Dict[str, SegmentCodec] = {
+    "file_list": FileListCodec(),
+    "key_value_int": KeyValueIntCodec(),
+}
+
+
+def get_segment_name(hwm_name: str, slot: int) -> str:
+    """Return name of HWM record containing segment of HWM value."""
+    return f"{hwm_name}#segment-{slot}"
+
+
+def is_segment_name(name: str) -> bool:
+    """Return ``True`` if HWM record contains segment of another HWM, and should not be exposed to users."""
+    return SEGMENT_NAME_PATTERN.search(name) is not None
+
+
+def is_segmented_type(hwm_type: str) -> bool:
+    return hwm_type.endswith(SEGMENTED_TYPE_SUFFIX)
+
+
+def get_segmented_type(hwm_type: str) -> str:
+    return hwm_type + SEGMENTED_TYPE_SUFFIX
+
+
+def get_base_type(hwm_type: str) -> str:
+    return hwm_type[: -len(SEGMENTED_TYPE_SUFFIX)]
+
+
+def plan_segments(
+    codec: SegmentCodec,
+    segments: List[Segment],
+    value: Any,
+    max_segments: int,
+) -> Tuple[Optional[Segment], List[Segment]]:
+    """
+    Calculate how to store new HWM value, if current value is stored in ``segments``.
+
+    Only the part of value which was changed since the previous write is stored in new segment.
+    To keep the number of segments small, the new segment is merged with the previous ones
+    while they are not larger than the new one, so segment sizes are always decreasing,
+    and there are at most ``log2(len(value))`` of them. If there are still more than ``max_segments``,
+    or value cannot be represented as a change of the current one (e.g. some items were removed),
+    the entire value is written to one segment.
+
+    New segment always uses slot which is not used by current segments,
+    so they are left intact until head record is updated to point to new segments.
+
+    Returns
+    -------
+    Tuple[Optional[Segment], List[Segment]]
+        Segment which should be written (or ``None`` if value was not changed),
+        and new list of segments.
+    """
+    current_value = codec.merge(segment.value for segment in segments)
+    changed, requires_compaction = codec.diff(current_value, value)
+    if not changed and not requires_compaction:
+        return None, segments
+
+    used_slots = {segment.slot for segment in segments}
+    slot = next(number for number in itertools.count() if number not in used_slots)
+
+    if requires_compaction:
+        new_segment = Segment(slot=slot, value=value)
+        return new_segment, [new_segment]
+
+    kept = list(segments)
+    new_value = changed
+    while kept and len(kept[-1].value) <= len(new_value):
+        new_value = codec.merge([kept.pop().value, new_value])
+
+    if len(kept) >= max_segments:
+        kept = []
+        new_value = value
+
+    new_segment = Segment(slot=slot, value=new_value)
+    return new_segment, [*kept, new_segment]
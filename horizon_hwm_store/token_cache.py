@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2023-2025 MTS PJSC
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import json
+import logging
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+log = logging.getLogger(__name__)
+
+# token expiring in less than this number of seconds is not reused
+EXPIRATION_MARGIN = 30
+
+
+class TokenCache:
+    """
+    Cache of access tokens.
+
+    Tokens are always cached in memory of the current process.
+    If ``path`` is set, tokens are also saved to this file, so they can be reused by other processes.
+    File is created with ``0600`` permissions, and it is ignored if other users have access to it.
+
+    Parameters
+    ----------
+    path : :obj:`pathlib.Path`, optional
+        Path to JSON file with tokens.
+    """
+
+    _tokens: Dict[str, dict] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path else None
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None and self.path:
+                token = self._read_file().get(key)
+                if token:
+                    self._tokens[key] = token
+
+        if not token:
+            return None
+
+        expires_at = token.get("expires_at")
+        if expires_at is not None and expires_at - EXPIRATION_MARGIN < time.time():
+            return None
+        return token
+
+    def set(self, key: str, token: dict) -> None:
+        with self._lock:
+            self._tokens[key] = token
+            if self.path:
+                tokens = self._read_file()
+                tokens[key] = token
+                self._write_file(tokens)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._tokens.pop(key, None)
+            if self.path:
+                tokens = self._read_file()
+                if tokens.pop(key, None) is not None:
+                    self._write_file(tokens)
+
+    def _read_file(self) -> Dict[str, dict]:
+        path: Path = self.path  # type: ignore[assignment]
+        if not path.exists():
+            return {}
+
+        if path.stat().st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            log.warning(
+                "|%s| Token cache file %s is accessible by other users, ignoring it",
+                self.__class__.__name__,
+                path,
+            )
+            return {}
+
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            log.warning("|%s| Token cache file %s is malformed, ignoring it", self.__class__.__name__, path)
+            return {}
+
+    def _write_file(self, tokens: Dict[str, dict]) -> None:
+        path: Path = self.path  # type: ignore[assignment]
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(tokens, file)
+        os.replace(tmp_path, path)
@@ -0,0 +1,105 @@
+"""
+Measure peak memory (RSS) used for converting Horizon response to HWM object, depending on HWM value size.
+
+Each measurement is performed in a separate process, because peak RSS cannot be reset.
+
+Usage:
+
+.. code:: bash
+
+    python -m tests.benchmarks.hwm_decode_memory --sizes 10000 100000 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import resource
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+HWM_TYPES = ("file_list", "key_value_int")
+MODES = ("legacy", "current")
+MODULE_NAME = "tests.benchmarks.hwm_decode_memory"
+
+
+def get_peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux, and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / 1024 / 1024 if sys.platform == "darwin" else peak_rss / 1024
+
+
+def make_response_json(hwm_type: str, size: int) -> str:
+    if hwm_type == "file_list":
+        value: object = [f"/some/directory/subdirectory/file_{number:010d}.csv" for number in range(size)]
+    else:
+        value = {str(number): number * 1000 for number in range(size)}
+
+    return json.dumps(
+        {
+            "id": 1,
+            "namespace_id": 1,
+            "name": "some_hwm",
+            "description": "",
+            "type": hwm_type,
+            "value": value,
+            "entity": "/some/directory" if hwm_type == "file_list" else None,
+            "expression": None,
+            "changed_at": datetime.now(tz=timezone.utc).isoformat(),
+            "changed_by": "user",
+        },
+    )
+
+
+def measure(hwm_type: str, size: int, mode: str) -> None:
+    from etl_entities.hwm import HWMTypeRegistry
+    from horizon.commons.schemas.v1 import HWMResponseV1
+
+    from horizon_hwm_store import HorizonHWMStore
+
+    # response is parsed by Horizon client before it is passed to HWM store, so it is not measured
+    response = HWMResponseV1.parse_raw(make_response_json(hwm_type, size))
+    gc.collect()
+    before = get_peak_rss_mb()
+
+    if mode == "legacy":
+        hwm_data = response.dict(exclude={"id", "namespace_id", "changed_by", "changed_at"})
+        hwm_data["modified_time"] = response.changed_at
+        hwm = HWMTypeRegistry.parse(hwm_data)
+    else:
+        hwm = HorizonHWMStore._parse_hwm(response)
+
+    after = get_peak_rss_mb()
+    assert len(hwm.value) == size
+    print(json.dumps({"type": hwm_type, "size": size, "mode": mode, "peak_rss_increase_mb": round(after - before, 1)}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--types", choices=HWM_TYPES, nargs="+", default=list(HWM_TYPES))
+    parser.add_argument("--modes", choices=MODES, nargs="+", default=list(MODES))
+    parser.add_argument("--child", nargs=3, metavar=("TYPE", "SIZE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        hwm_type, size, mode = args.child
+        measure(hwm_type, int(size), mode)
+        return
+
+    print(f"{'type':<15} {'size':>10} {'mode':<10} {'peak RSS increase, MB':>22}")
+    for hwm_type in args.types:
+        for size in args.sizes:
+            for mode in args.modes:
+                output = subprocess.check_output(
+                    [sys.executable, "-m", MODULE_NAME, "--child", hwm_type, str(size), mode],
+                    stderr=subprocess.DEVNULL,
+                )
+                result = json.loads(output.splitlines()[-1])
+                print(f"{hwm_type:<15} {size:>10} {mode:<10} {result['peak_rss_increase_mb']:>22}")
+
+
+if __name__ == "__main__":
+    main()
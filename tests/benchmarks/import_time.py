@@ -0,0 +1,122 @@
+"""
+Measure time of ``import horizon_hwm_store`` and construction of ``HorizonHWMStore`` instance.
+
+Each measurement is performed in a separate process, because imported modules are cached.
+``import etl_entities.hwm_store`` is measured as a baseline, because it cannot be avoided.
+
+Usage:
+
+.. code:: bash
+
+    python -m tests.benchmarks.import_time --repeat 10 --top 10
+    python -m tests.benchmarks.import_time --max-ms 300  # fail if import is slower
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+MODULE_NAME = "tests.benchmarks.import_time"
+TARGETS = {
+    "baseline": "etl_entities.hwm_store",
+    "store": "horizon_hwm_store",
+}
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    # lines look like "import time:       123 |       4567 | some.module"
+    result: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split(":", 1)[1].split("|")
+        result[module.strip()] = int(cumulative)
+    return result
+
+
+def measure_import(module: str) -> Dict[str, int]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(process.stderr)
+
+
+def measure_construction() -> None:
+    import time
+
+    start = time.perf_counter()
+    from horizon_hwm_store import HorizonHWMStore
+
+    imported = time.perf_counter()
+    store = HorizonHWMStore(
+        api_url="http://some.domain.com",
+        auth={"login": "user", "password": "password"},
+        namespace="namespace",
+    )
+    constructed = time.perf_counter()
+    store.close()
+    print(json.dumps({"import_ms": (imported - start) * 1000, "construct_ms": (constructed - imported) * 1000}))
+
+
+def run_construction() -> Tuple[float, float]:
+    output = subprocess.check_output(
+        [sys.executable, "-m", MODULE_NAME, "--child"],
+        stderr=subprocess.DEVNULL,
+    )
+    result = json.loads(output.splitlines()[-1])
+    return result["import_ms"], result["construct_ms"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Show N slowest modules imported by horizon_hwm_store")
+    parser.add_argument("--max-ms", type=float, help="Exit with error if median import time exceeds this value")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_construction()
+        return
+
+    medians: Dict[str, float] = {}
+    last_run: Dict[str, int] = {}
+    for name, module in TARGETS.items():
+        timings: List[int] = []
+        for _ in range(args.repeat):
+            last_run = measure_import(module)
+            timings.append(last_run[module])
+        medians[name] = statistics.median(timings) / 1000
+
+    constructions = [run_construction() for _ in range(args.repeat)]
+    construct_ms = statistics.median(construct for _, construct in constructions)
+
+    print(f"{'target':<30} {'median, ms':>12}")
+    for name, module in TARGETS.items():
+        print(f"{'import ' + module:<30} {medians[name]:>12.1f}")
+    print(f"{'HorizonHWMStore(...)':<30} {construct_ms:>12.1f}")
+
+    baseline_modules = set(measure_import(TARGETS["baseline"]))
+    own_modules = sorted(
+        ((module, cumulative) for module, cumulative in last_run.items() if module not in baseline_modules),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    print(f"\n{'slowest modules not imported by baseline':<50} {'cumulative, ms':>15}")
+    for module, cumulative in own_modules[: args.top]:
+        print(f"{module:<50} {cumulative / 1000:>15.1f}")
+
+    if args.max_ms is not None and medians["store"] > args.max_ms:
+        sys.exit(f"import horizon_hwm_store took {medians['store']:.1f} ms, limit is {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
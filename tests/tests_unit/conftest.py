@@ -0,0 +1,175 @@
+import functools
+import secrets
+from copy import deepcopy
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+from horizon.client.auth import LoginPassword
+from horizon.commons.exceptions import EntityAlreadyExistsError, EntityNotFoundError
+from horizon.commons.schemas.v1 import (
+    HWMHistoryResponseV1,
+    HWMResponseV1,
+    NamespaceCreateRequestV1,
+    NamespaceResponseV1,
+    PageMetaResponseV1,
+    PageResponseV1,
+    UserResponseV1,
+)
+
+from horizon_hwm_store import HorizonHWMStore
+from horizon_hwm_store.horizon_hwm_store import _CHECKED_AT, _NAMESPACE_IDS
+
+HORIZON_URL = "http://some.domain.com"
+HORIZON_NAMESPACE = "namespace"
+
+
+class FakeHorizonClient:
+    """In-memory replacement of HorizonClientSync, implementing only methods used by HorizonHWMStore"""
+
+    base_url = HORIZON_URL
+
+    def __init__(self):
+        self.namespaces = {}
+        self.hwms = {}
+        self.history = []
+        self.last_hwm_id = 0
+
+    def whoami(self):
+        return UserResponseV1(id=1, username="user")
+
+    def close(self):
+        pass
+
+    def paginate_namespaces(self, query=None):
+        items = [namespace for namespace in self.namespaces.values() if not query or namespace.name == query.name]
+        return self._page(items, 1, 20)
+
+    def create_namespace(self, data):
+        if any(namespace.name == data.name for namespace in self.namespaces.values()):
+            raise EntityAlreadyExistsError("Namespace", "name", data.name)
+
+        namespace = NamespaceResponseV1(
+            id=len(self.namespaces) + 1,
+            name=data.name,
+            description="",
+            owned_by="user",
+            changed_at=datetime.now(tz=timezone.utc),
+        )
+        self.namespaces[namespace.id] = namespace
+        return namespace
+
+    def paginate_hwm(self, query):
+        items = [
+            hwm
+            for hwm in self.hwms.values()
+            if hwm.namespace_id == query.namespace_id and (not query.name or hwm.name == query.name)
+        ]
+        items.sort(key=lambda hwm: hwm.name)
+        return self._page(items, query.page, query.page_size)
+
+    def get_hwm(self, hwm_id):
+        if hwm_id not in self.hwms:
+            raise EntityNotFoundError("HWM", "id", hwm_id)
+        return deepcopy(self.hwms[hwm_id])
+
+    def create_hwm(self, data):
+        if data.namespace_id not in self.namespaces:
+            raise EntityNotFoundError("Namespace", "id", data.namespace_id)
+        if any(hwm.namespace_id == data.namespace_id and hwm.name == data.name for hwm in self.hwms.values()):
+            raise EntityAlreadyExistsError("HWM", "name", data.name)
+
+        self.last_hwm_id += 1
+        hwm = HWMResponseV1(
+            id=self.last_hwm_id,
+            changed_at=datetime.now(tz=timezone.utc),
+            **data.dict(),
+        )
+        self.hwms[hwm.id] = hwm
+        self._add_history(hwm, "Created")
+        return deepcopy(hwm)
+
+    def update_hwm(self, hwm_id, changes):
+        if hwm_id not in self.hwms:
+            raise EntityNotFoundError("HWM", "id", hwm_id)
+
+        hwm = self.hwms[hwm_id]
+        data = hwm.dict()
+        data.update(changes.dict(exclude_unset=True))
+        data["changed_at"] = datetime.now(tz=timezone.utc)
+        self.hwms[hwm_id] = HWMResponseV1(**data)
+        self._add_history(self.hwms[hwm_id], "Updated")
+        return deepcopy(self.hwms[hwm_id])
+
+    def delete_hwm(self, hwm_id):
+        if hwm_id not in self.hwms:
+            raise EntityNotFoundError("HWM", "id", hwm_id)
+        self._add_history(self.hwms.pop(hwm_id), "Deleted")
+
+    def paginate_hwm_history(self, query):
+        # like Horizon, return items from the newest to the oldest one
+        items = [item for item in reversed(self.history) if item.hwm_id == query.hwm_id]
+        return self._page(items, query.page, query.page_size)
+
+    def _add_history(self, hwm, action):
+        data = hwm.dict(exclude={"id"})
+        self.history.append(HWMHistoryResponseV1(id=len(self.history) + 1, hwm_id=hwm.id, action=action, **data))
+
+    @staticmethod
+    def _page(items, page, page_size):
+        pages_count = max((len(items) + page_size - 1) // page_size, 1)
+        meta = PageMetaResponseV1(
+            page=page,
+            page_size=page_size,
+            total_count=len(items),
+            pages_count=pages_count,
+            has_next=page < pages_count,
+            has_previous=page > 1,
+            next_page=page + 1 if page < pages_count else None,
+            previous_page=page - 1 if page > 1 else None,
+        )
+        start = (page - 1) * page_size
+        end = start + page_size
+        return PageResponseV1[type(items[0]) if items else HWMResponseV1](
+            meta=meta,
+            items=deepcopy(items[start:end]),
+        )
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_caches():
+    yield
+    _NAMESPACE_IDS.clear()
+    _CHECKED_AT.clear()
+
+
+@pytest.fixture
+def horizon_client():
+    fake_client = FakeHorizonClient()
+    fake_client.create_namespace(NamespaceCreateRequestV1(name=HORIZON_NAMESPACE))
+    client = Mock(wraps=fake_client)
+    client.base_url = fake_client.base_url
+    client.fake = fake_client
+    return client
+
+
+def build_store(horizon_client, namespace=HORIZON_NAMESPACE, **kwargs):
+    store = HorizonHWMStore(
+        api_url=HORIZON_URL,
+        auth=LoginPassword(login="user", password=secrets.token_hex()),
+        namespace=namespace,
+        **kwargs,
+    )
+    store._client = horizon_client
+    return store
+
+
+@pytest.fixture
+def create_store(horizon_client):
+    """Factory of stores using the same fake client, e.g. to emulate new process or another pipeline step"""
+    return functools.partial(build_store, horizon_client)
+
+
+@pytest.fixture
+def horizon_hwm_store(horizon_client):
+    return build_store(horizon_client)
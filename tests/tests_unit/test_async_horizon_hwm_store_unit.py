@@ -0,0 +1,91 @@
+import asyncio
+import secrets
+import threading
+
+from etl_entities.hwm import ColumnIntHWM
+from horizon.client.auth import LoginPassword
+
+from horizon_hwm_store import AsyncHorizonHWMStore
+
+
+def test_async_horizon_hwm_store(horizon_client):
+    async def main():
+        async with AsyncHorizonHWMStore(
+            api_url="http://some.domain.com",
+            auth=LoginPassword(login="user", password=secrets.token_hex()),
+            namespace="namespace",
+            max_workers=4,
+        ) as hwm_store:
+            hwm_store.store._client = horizon_client
+            assert await hwm_store.check() is hwm_store
+            assert await hwm_store.force_create_namespace() is hwm_store
+
+            hwms = [ColumnIntHWM(name=f"hwm_{i}", value=i) for i in range(10)]
+            await asyncio.gather(*(hwm_store.set_hwm(hwm) for hwm in hwms))
+
+            result = await asyncio.gather(*(hwm_store.get_hwm(hwm.name) for hwm in hwms))
+            assert result == hwms
+            assert await hwm_store.get_hwms(["hwm_1", "unknown"]) == {"hwm_1": hwms[1], "unknown": None}
+            assert await hwm_store.get_hwm("unknown") is None
+
+        horizon_client.close.assert_called_once()
+
+    asyncio.run(main())
+
+
+def test_async_horizon_hwm_store_close_does_not_block_event_loop(horizon_client):
+    released = threading.Event()
+    paginate_hwm = horizon_client.fake.paginate_hwm
+
+    def slow_paginate_hwm(query):
+        # if close() blocks the event loop, nobody releases the request
+        assert released.wait(timeout=5)
+        return paginate_hwm(query)
+
+    async def release():
+        await asyncio.sleep(0.1)
+        released.set()
+
+    async def main():
+        hwm_store = AsyncHorizonHWMStore(
+            api_url="http://some.domain.com",
+            auth=LoginPassword(login="user", password=secrets.token_hex()),
+            namespace="namespace",
+        )
+        hwm_store.store._client = horizon_client
+        horizon_client.paginate_hwm.side_effect = slow_paginate_hwm
+
+        request = asyncio.ensure_future(hwm_store.get_hwm("some_hwm"))
+        await asyncio.sleep(0.01)
+        await asyncio.gather(hwm_store.close(), release())
+        assert await request is None
+
+    asyncio.run(main())
+
+
+def test_async_horizon_hwm_store_write_behind(horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+
+    async def main():
+        async with AsyncHorizonHWMStore(
+            api_url="http://some.domain.com",
+            auth=LoginPassword(login="user", password=secrets.token_hex()),
+            namespace="namespace",
+            write_behind=True,
+        ) as hwm_store:
+            hwm_store.store._client = horizon_client
+            await hwm_store.set_hwm(hwm)
+            horizon_client.create_hwm.assert_not_called()
+
+            await hwm_store.set_hwm(hwm.copy(update={"value": 2}))
+            assert await hwm_store.flush() == {"some_hwm": "http://some.domain.com/v1/hwm/1"}
+            assert horizon_client.create_hwm.call_count == 1
+
+            await hwm_store.set_hwm(hwm.copy(update={"value": 3}))
+
+        # pending HWMs are flushed on exit
+        assert horizon_client.update_hwm.call_count == 1
+        assert not hwm_store.store._pending_hwms
+        assert horizon_client.fake.hwms[1].value == 3
+
+    asyncio.run(main())
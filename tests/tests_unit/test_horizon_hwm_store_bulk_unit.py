@@ -0,0 +1,101 @@
+import pytest
+from etl_entities.hwm import ColumnIntHWM
+
+
+@pytest.fixture
+def existing_hwms(horizon_hwm_store):
+    hwms = [ColumnIntHWM(name=f"hwm_{i:03d}", value=i) for i in range(120)]
+    for hwm in hwms:
+        horizon_hwm_store.set_hwm(hwm)
+    return hwms
+
+
+def test_horizon_hwm_store_get_hwms_scan_namespace(horizon_hwm_store, horizon_client, existing_hwms):
+    names = [hwm.name for hwm in existing_hwms[::10]] + ["unknown"]
+    horizon_client.reset_mock()
+
+    result = horizon_hwm_store.get_hwms(names)
+
+    assert result == {**{hwm.name: hwm for hwm in existing_hwms[::10]}, "unknown": None}
+    # 120 HWMs are 3 pages of size 50
+    assert horizon_client.paginate_hwm.call_count == 3
+    horizon_client.get_hwm.assert_not_called()
+
+
+def test_horizon_hwm_store_get_hwms_by_name(horizon_hwm_store, horizon_client, existing_hwms):
+    names = ["hwm_099", "unknown"]
+    horizon_client.reset_mock()
+
+    result = horizon_hwm_store.get_hwms(names)
+
+    assert result == {"hwm_099": existing_hwms[99], "unknown": None}
+    # first page of namespace + lookup of each name
+    assert horizon_client.paginate_hwm.call_count == 3
+
+
+@pytest.mark.parametrize("names", [[], ["hwm_001"]])
+def test_horizon_hwm_store_get_hwms_few_names(horizon_hwm_store, horizon_client, existing_hwms, names):
+    horizon_client.reset_mock()
+
+    result = horizon_hwm_store.get_hwms(names)
+
+    assert result == {name: existing_hwms[1] for name in names}
+    assert horizon_client.paginate_hwm.call_count == len(names)
+
+
+def test_horizon_hwm_store_set_hwms(horizon_hwm_store, horizon_client, existing_hwms):
+    new_hwms = [hwm.copy(update={"value": hwm.value + 1000}) for hwm in existing_hwms[:60]]
+    new_hwms.append(ColumnIntHWM(name="new_hwm", value=1))
+
+    horizon_client.reset_mock()
+
+    result = horizon_hwm_store.set_hwms(new_hwms)
+
+    assert set(result) == {hwm.name for hwm in new_hwms}
+    assert all(url.startswith("http://some.domain.com/v1/hwm/") for url in result.values())
+    # ids are cached, so HWMs are saved without any lookups
+    horizon_client.paginate_hwm.assert_not_called()
+    assert horizon_client.update_hwm.call_count == 60
+    assert horizon_client.create_hwm.call_count == 1
+    assert horizon_hwm_store.get_hwms([hwm.name for hwm in new_hwms]) == {hwm.name: hwm for hwm in new_hwms}
+
+
+def test_horizon_hwm_store_set_hwms_partial_failure(horizon_hwm_store, horizon_client, existing_hwms):
+    error = RuntimeError("Some error")
+    original_update_hwm = horizon_client.fake.update_hwm
+
+    def update_hwm(hwm_id, changes):
+        if changes.name == "hwm_001":
+            raise error
+        return original_update_hwm(hwm_id, changes)
+
+    horizon_client.update_hwm.side_effect = update_hwm
+    new_hwms = [hwm.copy(update={"value": 100}) for hwm in existing_hwms[:3]]
+
+    result = horizon_hwm_store.set_hwms(new_hwms)
+
+    assert result["hwm_001"] is error
+    assert isinstance(result["hwm_000"], str)
+    assert isinstance(result["hwm_002"], str)
+    assert horizon_hwm_store.get_hwm("hwm_002").value == 100
+
+
+def test_horizon_hwm_store_set_hwms_failed_lookup(horizon_hwm_store, horizon_client, existing_hwms):
+    error = ConnectionError("Connection refused")
+    original_paginate_hwm = horizon_client.fake.paginate_hwm
+
+    def paginate_hwm(query):
+        if query.name == "hwm_050":
+            raise error
+        return original_paginate_hwm(query)
+
+    # ids are unknown, so they are resolved after optimistic create fails
+    horizon_hwm_store._hwm_ids.clear()
+    horizon_client.paginate_hwm.side_effect = paginate_hwm
+    new_hwms = [existing_hwms[10].copy(update={"value": 100}), existing_hwms[50].copy(update={"value": 100})]
+
+    result = horizon_hwm_store.set_hwms(new_hwms)
+
+    assert result["hwm_050"] is error
+    assert isinstance(result["hwm_010"], str)
+    assert horizon_client.fake.hwms[11].value == 100
@@ -0,0 +1,214 @@
+import functools
+import time
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM
+from horizon.commons.exceptions import PermissionDeniedError
+
+from horizon_hwm_store import HorizonHWMStore
+from horizon_hwm_store.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitState,
+)
+
+RESET_TIMEOUT = 0.1
+
+
+@pytest.fixture
+def create_store(create_store, tmp_path):
+    return functools.partial(
+        create_store,
+        local_cache_path=tmp_path / "cache.db",
+        write_behind_journal=tmp_path / "journal.jsonl",
+        circuit_breaker_threshold=2,
+        circuit_breaker_reset_timeout=RESET_TIMEOUT,
+    )
+
+
+def set_unavailable(horizon_client, unavailable=True):
+    for method in ("paginate_hwm", "get_hwm", "create_hwm", "update_hwm"):
+        getattr(horizon_client, method).side_effect = ConnectionError("Connection refused") if unavailable else None
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=RESET_TIMEOUT)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    # only one probe request is allowed
+    time.sleep(RESET_TIMEOUT * 1.5)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    # failed probe opens circuit again
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    time.sleep(RESET_TIMEOUT * 1.5)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_horizon_hwm_store_circuit_breaker(create_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    with create_store() as hwm_store:
+        hwm_store.set_hwm(hwm)
+        assert hwm_store.circuit_state == CircuitState.CLOSED
+        assert hwm_store.replay_lag == 0
+
+        set_unavailable(horizon_client)
+
+        # reads are served from local cache, writes are queued
+        assert hwm_store.get_hwm("some_hwm") == hwm
+        hwm_store.set_hwm(hwm.copy(update={"value": 2}))
+        assert hwm_store.circuit_state == CircuitState.OPEN
+        assert hwm_store.write_behind_journal.exists()
+
+        # requests are not sent while circuit is open
+        horizon_client.reset_mock()
+        hwm_store.set_hwm(hwm.copy(update={"value": 3}))
+        assert hwm_store.get_hwm("some_hwm").value == 3
+        assert hwm_store.replay_lag > 0
+        horizon_client.create_hwm.assert_not_called()
+        horizon_client.update_hwm.assert_not_called()
+
+        # queued changes are sent before new ones, after Horizon is available again
+        set_unavailable(horizon_client, False)
+        time.sleep(RESET_TIMEOUT * 1.5)
+        hwm_store.set_hwm(ColumnIntHWM(name="other_hwm", value=10))
+        assert hwm_store.circuit_state == CircuitState.CLOSED
+        assert hwm_store.replay_lag == 0
+        assert not hwm_store.write_behind_journal.exists()
+
+    assert create_store().get_hwm("some_hwm").value == 3
+    assert create_store().get_hwm("other_hwm").value == 10
+
+
+def test_horizon_hwm_store_circuit_breaker_bulk(create_store, horizon_client):
+    hwm_store = create_store()
+    hwm_store.set_hwms([ColumnIntHWM(name="some_hwm", value=1), ColumnIntHWM(name="other_hwm", value=2)])
+    set_unavailable(horizon_client)
+
+    # reads are served from local cache
+    for _ in range(2):
+        hwms = hwm_store.get_hwms(["some_hwm", "other_hwm"])
+        assert {name: hwm.value for name, hwm in hwms.items()} == {"some_hwm": 1, "other_hwm": 2}
+    assert hwm_store.circuit_state == CircuitState.OPEN
+
+    # requests are not sent while circuit is open, writes are queued
+    horizon_client.reset_mock()
+    results = hwm_store.set_hwms([ColumnIntHWM(name="some_hwm", value=3), ColumnIntHWM(name="new_hwm", value=4)])
+    assert results == {
+        "some_hwm": "http://some.domain.com/v1/hwm/1",
+        "new_hwm": "http://some.domain.com/v1/hwm/?namespace_id=1&name=new_hwm",
+    }
+    assert hwm_store.replay_lag > 0
+    assert hwm_store.write_behind_journal.exists()
+
+    hwms = hwm_store.get_hwms(["some_hwm", "other_hwm"])
+    assert {name: hwm.value for name, hwm in hwms.items()} == {"some_hwm": 3, "other_hwm": 2}
+    with pytest.raises(CircuitBreakerOpenError):
+        hwm_store.get_hwms(["other_hwm", "unknown_hwm"])
+
+    horizon_client.paginate_hwm.assert_not_called()
+    horizon_client.get_hwm.assert_not_called()
+    horizon_client.create_hwm.assert_not_called()
+    horizon_client.update_hwm.assert_not_called()
+
+    # queued changes are sent after Horizon is available again
+    set_unavailable(horizon_client, False)
+    time.sleep(RESET_TIMEOUT * 1.5)
+    hwms = hwm_store.get_hwms(["some_hwm", "other_hwm", "new_hwm"])
+    assert {name: hwm.value for name, hwm in hwms.items()} == {"some_hwm": 3, "other_hwm": 2, "new_hwm": 4}
+    assert hwm_store.circuit_state == CircuitState.CLOSED
+    assert hwm_store.replay_lag == 0
+
+    hwms = create_store().get_hwms(["some_hwm", "other_hwm", "new_hwm"])
+    assert {name: hwm.value for name, hwm in hwms.items()} == {"some_hwm": 3, "other_hwm": 2, "new_hwm": 4}
+
+
+def test_horizon_hwm_store_circuit_breaker_bulk_write_failed(create_store, horizon_client):
+    hwm_store = create_store()
+    hwm_store.set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+    set_unavailable(horizon_client)
+
+    results = hwm_store.set_hwms([ColumnIntHWM(name="some_hwm", value=2), ColumnIntHWM(name="other_hwm", value=3)])
+    assert results == {
+        "some_hwm": "http://some.domain.com/v1/hwm/1",
+        "other_hwm": "http://some.domain.com/v1/hwm/?namespace_id=1&name=other_hwm",
+    }
+    assert hwm_store.replay_lag > 0
+
+    set_unavailable(horizon_client, False)
+    hwm_store.flush()
+    assert {hwm.name: hwm.value for hwm in horizon_client.fake.hwms.values()} == {"some_hwm": 2, "other_hwm": 3}
+
+
+def test_horizon_hwm_store_circuit_breaker_keeps_journal_on_exit(create_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    create_store().set_hwm(hwm)
+    set_unavailable(horizon_client)
+
+    # exiting context does not fail, changes are sent by the next store
+    with create_store() as hwm_store:
+        hwm_store.set_hwm(hwm.copy(update={"value": 2}))
+    assert hwm_store.write_behind_journal.exists()
+
+    set_unavailable(horizon_client, False)
+    with create_store() as hwm_store:
+        assert hwm_store.replay_lag > 0
+        assert hwm_store.get_hwm("other_hwm") is None
+        assert hwm_store.replay_lag == 0
+
+    assert horizon_client.fake.hwms[1].value == 2
+
+
+def test_horizon_hwm_store_circuit_breaker_without_local_value(create_store, horizon_client):
+    hwm_store = create_store()
+    hwm_store.set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+    set_unavailable(horizon_client)
+
+    with pytest.raises(ConnectionError):
+        hwm_store.get_hwm("unknown_hwm")
+    with pytest.raises(ConnectionError):
+        hwm_store.get_hwm("unknown_hwm")
+
+    # fail fast
+    horizon_client.reset_mock()
+    with pytest.raises(CircuitBreakerOpenError):
+        hwm_store.get_hwm("unknown_hwm")
+    horizon_client.paginate_hwm.assert_not_called()
+
+
+def test_horizon_hwm_store_circuit_breaker_ignores_client_errors(create_store, horizon_client):
+    hwm_store = create_store()
+    hwm_store.set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+    horizon_client.paginate_hwm.side_effect = PermissionDeniedError("Developer", "Maintainer")
+
+    for _ in range(3):
+        with pytest.raises(PermissionDeniedError):
+            hwm_store.get_hwm("other_hwm")
+    assert hwm_store.circuit_state == CircuitState.CLOSED
+
+
+@pytest.mark.parametrize(
+    "options, missing",
+    [
+        ({}, "local_cache_path and write_behind_journal"),
+        ({"local_cache_path": "cache.db"}, "write_behind_journal"),
+        ({"write_behind_journal": "journal.jsonl"}, "local_cache_path"),
+    ],
+)
+def test_horizon_hwm_store_circuit_breaker_requires_local_storage(horizon_hwm_store: HorizonHWMStore, options, missing):
+    with pytest.raises(ValueError, match=f"Tiered mode requires {missing} to be set"):
+        HorizonHWMStore(**{**horizon_hwm_store.dict(), **options, "circuit_breaker_threshold": 2})
@@ -0,0 +1,55 @@
+import secrets
+from unittest.mock import patch
+
+import pytest
+from horizon.client.auth import LoginPassword
+from horizon.client.sync import RetryConfig
+
+from horizon_hwm_store import HorizonHWMStore
+from horizon_hwm_store.client_pool import HorizonClientPool
+
+
+@pytest.fixture
+def store_options():
+    return {
+        "api_url": "http://some.domain.com",
+        "auth": LoginPassword(login="user", password=secrets.token_hex()),
+        "namespace": "namespace",
+    }
+
+
+def test_horizon_hwm_store_shares_client(store_options):
+    store1 = HorizonHWMStore(**store_options)
+    store2 = HorizonHWMStore(**store_options)
+    assert store1.client is store2.client
+
+    other_password = HorizonHWMStore(**{**store_options, "auth": LoginPassword(login="user", password="other")})
+    other_retry = HorizonHWMStore(**store_options, retry=RetryConfig(total=10))
+    not_shared = HorizonHWMStore(**store_options, share_client=False)
+    for other_store in (other_password, other_retry, not_shared):
+        assert other_store.client is not store1.client
+
+    client = store1.client
+    with patch.object(client.session, "close") as close:
+        store1.close()
+        close.assert_not_called()
+
+        store2.close()
+        close.assert_called_once()
+
+    # new client is created after all stores were closed
+    assert store1.client is not client
+    for store in (store1, other_password, other_retry, not_shared):
+        store.close()
+
+
+def test_horizon_client_pool_close_all(store_options):
+    store = HorizonHWMStore(**store_options)
+    client = store.client
+
+    with patch.object(client.session, "close") as close:
+        HorizonClientPool.close_all()
+        close.assert_called_once()
+
+    # release of already closed client is ignored
+    store.close()
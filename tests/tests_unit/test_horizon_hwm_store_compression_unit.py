@@ -0,0 +1,53 @@
+import gzip
+import json
+import secrets
+from unittest.mock import patch
+
+from horizon.client.auth import LoginPassword
+from requests import Request
+from requests.adapters import HTTPAdapter
+
+from horizon_hwm_store import HorizonHWMStore
+from horizon_hwm_store.client import GzipHTTPAdapter
+
+
+def test_gzip_http_adapter():
+    adapter = GzipHTTPAdapter(threshold=100)
+    value = [f"/some/file{number}" for number in range(100)]
+    large = Request("PATCH", "http://some.domain.com/v1/hwm/1", json={"value": value}).prepare()
+    small = Request("PATCH", "http://some.domain.com/v1/hwm/1", json={"value": 1}).prepare()
+    original_body = large.body
+
+    with patch.object(HTTPAdapter, "send") as send:
+        adapter.send(large)
+        adapter.send(small)
+
+    sent_large, sent_small = (call.args[0] for call in send.call_args_list)
+    assert sent_large.headers["Content-Encoding"] == "gzip"
+    assert int(sent_large.headers["Content-Length"]) == len(sent_large.body) < len(original_body)
+    assert json.loads(gzip.decompress(sent_large.body)) == {"value": value}
+
+    assert "Content-Encoding" not in sent_small.headers
+    assert json.loads(sent_small.body) == {"value": 1}
+
+
+def test_horizon_hwm_store_compression_threshold():
+    store_options = {
+        "api_url": "http://some.domain.com",
+        "auth": LoginPassword(login="user", password=secrets.token_hex()),
+        "namespace": "namespace",
+    }
+    store = HorizonHWMStore(**store_options, compression_threshold=1024)
+    adapter = store.client.session.get_adapter("http://some.domain.com")
+    assert isinstance(adapter, GzipHTTPAdapter)
+    assert adapter.threshold == 1024
+    # retries are still configured
+    assert adapter.max_retries.total == store.retry.total
+
+    # compression is disabled by default, and client with compression is not shared with other stores
+    default_store = HorizonHWMStore(**store_options)
+    assert not isinstance(default_store.client.session.get_adapter("http://some.domain.com"), GzipHTTPAdapter)
+    assert default_store.client is not store.client
+
+    store.close()
+    default_store.close()
@@ -0,0 +1,137 @@
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM
+from horizon.client.auth import LoginPassword
+from requests import Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from horizon_hwm_store import HorizonHWMStore
+from horizon_hwm_store.client import DeadlineHTTPAdapter, DeadlineRetry
+from horizon_hwm_store.deadline import (
+    OperationTimeoutError,
+    deadline,
+    get_remaining_time,
+)
+
+
+def test_deadline():
+    assert get_remaining_time() is None
+    with deadline(10):
+        assert 9 < get_remaining_time() <= 10
+
+        # nested deadline cannot extend the outer one
+        with deadline(100):
+            assert get_remaining_time() <= 10
+        with deadline(1):
+            assert get_remaining_time() <= 1
+        with deadline(None):
+            assert 9 < get_remaining_time() <= 10
+
+    assert get_remaining_time() is None
+
+
+def test_deadline_retry():
+    retry = DeadlineRetry.from_retry(Retry(total=3, backoff_factor=10, status_forcelist=[502]))
+    assert retry.total == 3
+    assert retry.status_forcelist == [502]
+    retry = retry.increment(method="GET", url="/").increment(method="GET", url="/")
+    assert retry.get_backoff_time() == 20
+    assert not retry.is_exhausted()
+
+    with deadline(1):
+        assert retry.get_backoff_time() <= 1
+    with deadline(0):
+        assert retry.get_backoff_time() == 0
+        assert retry.is_exhausted()
+
+
+def test_deadline_http_adapter():
+    adapter = DeadlineHTTPAdapter()
+    request = Request("GET", "http://some.domain.com/v1/hwm/1").prepare()
+
+    with patch.object(HTTPAdapter, "send") as send:
+        adapter.send(request, timeout=(5, 30))
+        with deadline(10):
+            adapter.send(request, timeout=(5, 30))
+            adapter.send(request, timeout=None)
+
+    timeouts = [call.kwargs["timeout"] for call in send.call_args_list]
+    assert timeouts[0] == (5, 30)
+    assert timeouts[1][0] == 5
+    assert 9 < timeouts[1][1] <= 10
+    assert 9 < timeouts[2] <= 10
+
+    # request is not sent if deadline is passed
+    with patch.object(HTTPAdapter, "send") as send, deadline(0):
+        with pytest.raises(OperationTimeoutError):
+            adapter.send(request, timeout=(5, 30))
+    send.assert_not_called()
+
+
+def test_horizon_hwm_store_operation_timeout_is_shared(create_store, horizon_client):
+    hwm_store = create_store(operation_timeout=10)
+    hwm_store.set_hwms(ColumnIntHWM(name=f"hwm_{number}", value=number) for number in range(3))
+
+    remaining = []
+
+    def paginate_hwm(query):
+        remaining.append(get_remaining_time())
+        time.sleep(0.05)
+        return horizon_client.fake.paginate_hwm(query)
+
+    horizon_client.paginate_hwm.side_effect = paginate_hwm
+    hwm_store.get_hwm("hwm_0")
+    hwm_store.get_hwms(["hwm_1", "hwm_2", "missing"])
+
+    # deadline is reset for each operation, and passed to threads
+    assert all(value is not None for value in remaining)
+    assert remaining[0] > remaining[-1] > 9
+    assert get_remaining_time() is None
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802
+        time.sleep(2)
+        self.send_response(500)
+        self.end_headers()
+
+    do_GET = do_POST  # noqa: N815
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_horizon_hwm_store_operation_timeout(slow_server):
+    hwm_store = HorizonHWMStore(
+        api_url=slow_server,
+        auth=LoginPassword(login="user", password=secrets.token_hex()),
+        namespace="namespace",
+        retry={"total": 5, "backoff_factor": 1},
+        timeout={"connection_timeout": 30, "request_timeout": 30},
+        operation_timeout=0.3,
+        share_client=False,
+        token_cache=False,
+    )
+
+    start = time.monotonic()
+    with pytest.raises(OperationTimeoutError):
+        hwm_store.get_hwm("some_hwm")
+    assert 0.25 < time.monotonic() - start < 1.5
+    hwm_store.close()
@@ -0,0 +1,194 @@
+import functools
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM, FileListHWM, KeyValueIntHWM
+from horizon.commons.schemas.v1 import HWMCreateRequestV1
+
+from horizon_hwm_store.segments import FileListCodec, KeyValueIntCodec, Segment, plan_segments
+
+
+def paths(*numbers):
+    return frozenset(f"/some/file{number}" for number in numbers)
+
+
+def test_plan_segments_file_list():
+    # first write
+    new_segment, segments = plan_segments(FileListCodec(), [], paths(*range(10)), max_segments=10)
+    assert new_segment == Segment(slot=0, value=paths(*range(10)))
+    assert segments == [new_segment]
+
+    # only added paths are written
+    new_segment, segments = plan_segments(FileListCodec(), segments, paths(*range(12)), max_segments=10)
+    assert new_segment == Segment(slot=1, value=paths(10, 11))
+    assert segments == [Segment(slot=0, value=paths(*range(10))), new_segment]
+
+    # nothing changed
+    assert plan_segments(FileListCodec(), segments, paths(*range(12)), max_segments=10) == (None, segments)
+
+    # segments of the same size are merged, new segment uses unused slot
+    new_segment, segments = plan_segments(FileListCodec(), segments, paths(*range(14)), max_segments=10)
+    assert new_segment == Segment(slot=2, value=paths(10, 11, 12, 13))
+    assert segments == [Segment(slot=0, value=paths(*range(10))), new_segment]
+
+    new_segment, segments = plan_segments(FileListCodec(), segments, paths(*range(15)), max_segments=10)
+    assert new_segment == Segment(slot=1, value=paths(14))
+    assert [segment.slot for segment in segments] == [0, 2, 1]
+
+    # path is removed, everything is compacted
+    new_segment, segments = plan_segments(FileListCodec(), segments, paths(*range(1, 15)), max_segments=10)
+    assert new_segment == Segment(slot=3, value=paths(*range(1, 15)))
+    assert segments == [new_segment]
+
+
+def test_plan_segments_max_segments():
+    segments = [Segment(slot=0, value=paths(*range(100))), Segment(slot=1, value=paths(*range(100, 110)))]
+    new_segment, segments = plan_segments(FileListCodec(), segments, paths(*range(111)), max_segments=2)
+    assert new_segment == Segment(slot=2, value=paths(*range(111)))
+    assert segments == [new_segment]
+
+
+def test_plan_segments_key_value_int():
+    codec = KeyValueIntCodec()
+    offsets = {str(partition): 100 for partition in range(10)}
+    new_segment, segments = plan_segments(codec, [], offsets, max_segments=10)
+    assert new_segment == Segment(slot=0, value=offsets)
+
+    # only changed partitions are written
+    offsets = {**offsets, "3": 150, "10": 5}
+    new_segment, segments = plan_segments(codec, segments, offsets, max_segments=10)
+    assert new_segment == Segment(slot=1, value={"3": 150, "10": 5})
+    assert plan_segments(codec, segments, offsets, max_segments=10) == (None, segments)
+
+    # newer segments override older ones while merging
+    offsets = {**offsets, "3": 200, "4": 120}
+    new_segment, segments = plan_segments(codec, segments, offsets, max_segments=10)
+    assert new_segment == Segment(slot=2, value={"3": 200, "4": 120, "10": 5})
+    assert [segment.slot for segment in segments] == [0, 2]
+    assert codec.merge(segment.value for segment in segments) == offsets
+
+    # offset moved back, everything is compacted
+    offsets = {**offsets, "4": 110}
+    new_segment, segments = plan_segments(codec, segments, offsets, max_segments=10)
+    assert segments == [Segment(slot=1, value=offsets)]
+
+    # partition is removed
+    offsets = {key: offset for key, offset in offsets.items() if key != "10"}
+    new_segment, segments = plan_segments(codec, segments, offsets, max_segments=10)
+    assert segments == [Segment(slot=0, value=offsets)]
+
+
+@pytest.fixture
+def create_store(create_store):
+    return functools.partial(create_store, delta_writes=True, max_segments=4)
+
+
+@pytest.fixture
+def hwm_store(create_store):
+    return create_store()
+
+
+def sent_values(horizon_client):
+    requests = [
+        call.args[-1] for call in horizon_client.create_hwm.call_args_list + horizon_client.update_hwm.call_args_list
+    ]
+    return {request.name: request.value for request in requests if request.name != "some_hwm"}
+
+
+def test_horizon_hwm_store_delta_writes(create_store, hwm_store, horizon_client):
+    hwm = FileListHWM(name="some_hwm", value=paths(*range(100)), directory="/some")
+    hwm_store.set_hwm(hwm)
+    assert len(sent_values(horizon_client)["some_hwm#segment-0"]) == 100
+
+    horizon_client.reset_mock()
+    hwm_store.set_hwm(hwm + paths(100, 101))
+    assert sent_values(horizon_client) == {"some_hwm#segment-1": sorted(paths(100, 101))}
+
+    # HWM is read by another store
+    other_store = create_store()
+    result = other_store.get_hwm("some_hwm")
+    assert result == hwm + paths(100, 101)
+    assert other_store.get_hwms(["some_hwm"]) == {"some_hwm": result}
+
+    # and then updated, using segments read by get_hwm
+    horizon_client.reset_mock()
+    other_store.set_hwm(result + paths(102))
+    assert sent_values(horizon_client) == {"some_hwm#segment-2": sorted(paths(102))}
+    horizon_client.paginate_hwm.assert_not_called()
+
+    # unchanged value is not sent
+    horizon_client.reset_mock()
+    other_store.set_hwm(result + paths(102))
+    horizon_client.update_hwm.assert_not_called()
+    assert other_store.suppressed_writes == 1
+
+    assert create_store().get_hwm("some_hwm") == result + paths(102)
+
+
+def test_horizon_hwm_store_delta_writes_segments_are_bounded(create_store, hwm_store, horizon_client):
+    hwm = FileListHWM(name="some_hwm", directory="/some")
+    for number in range(100):
+        hwm = hwm + paths(number)
+        hwm_store.set_hwm(hwm)
+
+    segment_names = {stored.name for stored in horizon_client.fake.hwms.values() if stored.name != "some_hwm"}
+    assert len(segment_names) <= 5
+    head = next(stored for stored in horizon_client.fake.hwms.values() if stored.name == "some_hwm")
+    assert len(head.value["segments"]) <= 4
+    assert create_store().get_hwm("some_hwm") == hwm
+
+
+def test_horizon_hwm_store_delta_writes_removed_paths(create_store, hwm_store, horizon_client):
+    hwm = FileListHWM(name="some_hwm", value=paths(*range(10)), directory="/some")
+    hwm_store.set_hwm(hwm)
+    hwm_store.set_hwm(hwm + paths(10))
+
+    hwm_store.set_hwm(hwm.copy().reset())
+    assert create_store().get_hwm("some_hwm").value == frozenset()
+
+
+def test_horizon_hwm_store_delta_writes_convert_existing_hwm(create_store, hwm_store, horizon_client):
+    hwm = FileListHWM(name="some_hwm", value=paths(*range(10)), directory="/some")
+    horizon_client.fake.create_hwm(HWMCreateRequestV1.parse_obj({**hwm.serialize(), "namespace_id": 1}))
+
+    hwm_store.set_hwm(hwm + paths(10))
+    assert sent_values(horizon_client) == {"some_hwm#segment-0": sorted(paths(*range(11)))}
+    assert create_store().get_hwm("some_hwm") == hwm + paths(10)
+
+    # other HWM types are stored as is
+    hwm_store.set_hwm(ColumnIntHWM(name="other_hwm", value=1))
+    assert create_store().get_hwm("other_hwm").value == 1
+
+
+def test_horizon_hwm_store_delta_writes_missing_segment(create_store, hwm_store, horizon_client):
+    hwm_store.set_hwm(FileListHWM(name="some_hwm", value=paths(1), directory="/some"))
+    segment_id = next(stored.id for stored in horizon_client.fake.hwms.values() if stored.name == "some_hwm#segment-0")
+    horizon_client.fake.delete_hwm(segment_id)
+
+    with pytest.raises(RuntimeError, match="Segment 'some_hwm#segment-0' of HWM 'some_hwm' not found"):
+        create_store().get_hwm("some_hwm")
+
+
+def test_horizon_hwm_store_delta_writes_key_value_int(create_store, hwm_store, horizon_client):
+    hwm = KeyValueIntHWM(name="some_hwm", value={partition: 100 for partition in range(1000)}, entity="topic")
+    hwm_store.set_hwm(hwm)
+    assert len(sent_values(horizon_client)["some_hwm#segment-0"]) == 1000
+
+    horizon_client.reset_mock()
+    hwm = hwm.copy(update={"value": {**hwm.value, 5: 200, 7: 300}})
+    hwm_store.set_hwm(hwm)
+    assert sent_values(horizon_client) == {"some_hwm#segment-1": {"5": 200, "7": 300}}
+
+    for offset in range(201, 250):
+        hwm = hwm.copy(update={"value": {**hwm.value, 5: offset}})
+        hwm_store.set_hwm(hwm)
+
+    result = create_store().get_hwm("some_hwm")
+    assert isinstance(result, KeyValueIntHWM)
+    assert result == hwm
+    assert result.value[5] == 249
+    assert result.value[7] == 300
+
+    # offset is decreased, e.g. after HWM reset
+    hwm = hwm.copy(update={"value": {**hwm.value, 5: 0}})
+    hwm_store.set_hwm(hwm)
+    assert create_store().get_hwm("some_hwm") == hwm
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM, FileListHWM, KeyValueIntHWM
+from horizon.commons.schemas.v1 import NamespaceCreateRequestV1
+
+from horizon_hwm_store import HorizonHWMStore
+
+
+@pytest.fixture
+def target_store(create_store, horizon_client):
+    horizon_client.fake.create_namespace(NamespaceCreateRequestV1(name="target"))
+    return create_store(namespace="target")
+
+
+@pytest.fixture
+def source_hwms(horizon_hwm_store: HorizonHWMStore):
+    hwms = [
+        *(ColumnIntHWM(name=f"hwm_{number:02d}", value=number, entity="some.table") for number in range(20)),
+        FileListHWM(name="file_hwm", directory="/some", value=["/some/file1", "/some/file2"]),
+        KeyValueIntHWM(name="kafka_hwm", value={0: 100, 1: 200}, entity="topic"),
+    ]
+    horizon_hwm_store.set_hwms(hwms)
+    return sorted(hwms, key=lambda hwm: hwm.name)
+
+
+def test_horizon_hwm_store_export_import_namespace(
+    horizon_hwm_store: HorizonHWMStore,
+    target_store: HorizonHWMStore,
+    horizon_client,
+    source_hwms,
+    tmp_path,
+):
+    path = tmp_path / "backup" / "namespace.jsonl"
+    assert horizon_hwm_store.export_namespace(path) == len(source_hwms)
+    assert len(path.read_text().splitlines()) == len(source_hwms)
+    assert not (tmp_path / "backup" / "namespace.jsonl.tmp").exists()
+
+    horizon_client.reset_mock()
+    progress = []
+    assert target_store.import_namespace(path, batch_size=10, progress=progress.append) == len(source_hwms)
+    assert progress == [10, 20, 22]
+
+    # target namespace was empty, so HWMs were created without any lookups
+    assert horizon_client.create_hwm.call_count == len(source_hwms)
+    horizon_client.paginate_hwm.assert_not_called()
+    assert not (tmp_path / "backup" / "namespace.jsonl.checkpoint").exists()
+
+    imported = list(target_store.iter_hwms())
+    assert [hwm.copy(update={"modified_time": None}) for hwm in imported] == [
+        hwm.copy(update={"modified_time": None}) for hwm in source_hwms
+    ]
+
+    # import into non-empty namespace updates existing HWMs
+    assert target_store.import_namespace(path) == len(source_hwms)
+    assert len(list(target_store.iter_hwms())) == len(source_hwms)
+
+
+def test_horizon_hwm_store_export_namespace_prefix(horizon_hwm_store: HorizonHWMStore, source_hwms, tmp_path):
+    path = tmp_path / "namespace.jsonl"
+    assert horizon_hwm_store.export_namespace(path, prefix="hwm_1") == 10
+    assert [json.loads(line)["name"] for line in path.read_text().splitlines()] == [f"hwm_1{n}" for n in range(10)]
+
+
+def test_horizon_hwm_store_import_namespace_resume(
+    horizon_hwm_store: HorizonHWMStore,
+    target_store: HorizonHWMStore,
+    horizon_client,
+    source_hwms,
+    tmp_path,
+):
+    path = tmp_path / "namespace.jsonl"
+    horizon_hwm_store.export_namespace(path)
+
+    create_hwm = horizon_client.fake.create_hwm
+
+    def failing_create_hwm(data):
+        if data.name == "hwm_15":
+            raise ConnectionError("Server is unavailable")
+        return create_hwm(data)
+
+    horizon_client.create_hwm.side_effect = failing_create_hwm
+    with pytest.raises(RuntimeError, match="Failed to import HWMs \\['hwm_15'\\]"):
+        target_store.import_namespace(path, batch_size=10)
+
+    checkpoint = json.loads((tmp_path / "namespace.jsonl.checkpoint").read_text())
+    assert checkpoint["imported"] == 10
+
+    # import continues from the failed batch
+    horizon_client.create_hwm.side_effect = create_hwm
+    horizon_client.reset_mock()
+    progress = []
+    assert target_store.import_namespace(path, batch_size=10, progress=progress.append) == len(source_hwms)
+    assert progress == [20, 22]
+    assert len(list(target_store.iter_hwms())) == len(source_hwms)
+    assert not (tmp_path / "namespace.jsonl.checkpoint").exists()
+
+
+def test_horizon_hwm_store_import_namespace_malformed_file(target_store: HorizonHWMStore, tmp_path):
+    path = tmp_path / "namespace.jsonl"
+    path.write_text(json.dumps(ColumnIntHWM(name="some_hwm", value=1).serialize()) + "\n\n{}\n")
+
+    with pytest.raises(ValueError, match="Malformed HWM at line 3"):
+        target_store.import_namespace(path)
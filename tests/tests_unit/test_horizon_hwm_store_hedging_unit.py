@@ -0,0 +1,137 @@
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from horizon.client.auth import LoginPassword
+from horizon.client.sync import HorizonClientSync
+
+from horizon_hwm_store import HorizonHWMStore
+from horizon_hwm_store.executor import run_inline
+from horizon_hwm_store.hedging import HedgingPolicy
+
+
+class SlowFirstCall:
+    """Function which hangs on the first call until released, and returns immediately on the next calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.released = threading.Event()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            number = self.calls
+        if number == 1:
+            self.released.wait(timeout=5)
+        return number
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def warm_up(policy: HedgingPolicy, executor, count=20):
+    for _ in range(count):
+        policy.run(executor, lambda: None)
+
+
+def test_hedging_policy_delay():
+    policy = HedgingPolicy(percentile=90, min_delay=0.01, max_extra_load=0.1, min_samples=10)
+    assert policy.get_delay() is None
+
+    for latency in range(1, 11):
+        policy._latencies.append(latency / 10)
+    assert policy.get_delay() == 0.9
+
+    policy = HedgingPolicy(percentile=90, min_delay=5, max_extra_load=0.1, min_samples=1)
+    policy._latencies.append(0.1)
+    assert policy.get_delay() == 5
+
+
+def test_hedging_policy_run(executor):
+    policy = HedgingPolicy(percentile=95, min_delay=0.01, max_extra_load=0.1)
+
+    # not enough samples, request is not hedged
+    func = SlowFirstCall()
+    func.released.set()
+    assert policy.run(executor, func) == 1
+
+    warm_up(policy, executor)
+    func = SlowFirstCall()
+    # slow request is hedged, and the first response is used
+    assert policy.run(executor, func) == 2
+    func.released.set()
+
+
+def test_hedging_policy_max_extra_load(executor):
+    policy = HedgingPolicy(percentile=95, min_delay=0.01, max_extra_load=0.1)
+    warm_up(policy, executor)
+
+    # 21 requests allow only 2 hedged requests
+    funcs = [SlowFirstCall() for _ in range(3)]
+    threading.Timer(0.3, lambda: [func.released.set() for func in funcs]).start()
+    assert [policy.run(executor, func) for func in funcs] == [2, 2, 1]
+
+
+def test_hedging_policy_both_failed(executor):
+    policy = HedgingPolicy(percentile=95, min_delay=0.01, max_extra_load=1)
+    warm_up(policy, executor)
+    errors = iter([ValueError("first"), ValueError("second")])
+    released = threading.Event()
+
+    def func():
+        error = next(errors)
+        if str(error) == "first":
+            released.wait(timeout=0.1)
+        raise error
+
+    with pytest.raises(ValueError, match="first"):
+        policy.run(executor, func)
+
+
+def test_horizon_hwm_store_hedge_reads():
+    store = HorizonHWMStore(
+        api_url="http://some.domain.com",
+        auth=LoginPassword(login="user", password=secrets.token_hex()),
+        namespace="namespace",
+        hedge_percentile=95,
+        hedge_min_delay=0.01,
+        hedge_max_extra_load=0.5,
+    )
+    client = store.client
+    assert client._hedging.percentile == 95
+
+    func = SlowFirstCall()
+    with patch.object(HorizonClientSync, "get_hwm", side_effect=lambda hwm_id: func()) as get_hwm:
+        for _ in range(20):
+            func.calls = 2
+            client.get_hwm(1)
+
+        func.calls = 0
+        assert client.get_hwm(1) == 2
+        func.released.set()
+        assert get_hwm.call_count == 22
+
+    store.close()
+
+    # executor cannot be used after it was shut down, e.g. on interpreter exit
+    with patch.object(HorizonClientSync, "get_hwm", return_value=3):
+        with pytest.raises(RuntimeError):
+            client.get_hwm(1)
+
+        with run_inline():
+            assert client.get_hwm(1) == 3
+
+    # hedging is disabled by default
+    default_store = HorizonHWMStore(
+        api_url="http://some.domain.com",
+        auth=LoginPassword(login="user", password=secrets.token_hex()),
+        namespace="namespace",
+    )
+    assert default_store.client._hedging is None
+    default_store.close()
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM, FileListHWM
+
+from horizon_hwm_store import HorizonHWMStore
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def hwm_with_history(horizon_hwm_store: HorizonHWMStore, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=0)
+    for value in range(30):
+        horizon_hwm_store.set_hwm(hwm.copy(update={"value": value}))
+
+    # value N was set at START + N minutes
+    horizon_client.fake.history = [
+        item.model_copy(update={"changed_at": START + timedelta(minutes=number)})
+        for number, item in enumerate(horizon_client.fake.history)
+    ]
+    horizon_client.reset_mock()
+    return hwm
+
+
+def test_horizon_hwm_store_iter_hwm_history(horizon_hwm_store: HorizonHWMStore, horizon_client, hwm_with_history):
+    history = list(horizon_hwm_store.iter_hwm_history("some_hwm", page_size=10))
+    assert [hwm.value for hwm in history] == list(reversed(range(30)))
+    assert history[0].modified_time == START + timedelta(minutes=29)
+    assert horizon_client.paginate_hwm_history.call_count == 3
+
+
+def test_horizon_hwm_store_iter_hwm_history_time_range(
+    horizon_hwm_store: HorizonHWMStore,
+    horizon_client,
+    hwm_with_history,
+):
+    history = horizon_hwm_store.iter_hwm_history(
+        "some_hwm",
+        since=START + timedelta(minutes=22),
+        until=START + timedelta(minutes=25),
+        page_size=5,
+    )
+    assert [hwm.value for hwm in history] == [25, 24, 23, 22]
+
+    # older pages are not fetched. One more page can be prefetched in background
+    assert horizon_client.paginate_hwm_history.call_count <= 3
+
+
+def test_horizon_hwm_store_iter_hwm_history_naive_datetime(horizon_hwm_store: HorizonHWMStore, hwm_with_history):
+    since = (START + timedelta(minutes=28)).astimezone().replace(tzinfo=None)
+    assert [hwm.value for hwm in horizon_hwm_store.iter_hwm_history("some_hwm", since=since)] == [29, 28]
+
+
+def test_horizon_hwm_store_iter_hwm_history_missing_hwm(horizon_hwm_store: HorizonHWMStore, horizon_client):
+    assert list(horizon_hwm_store.iter_hwm_history("missing_hwm")) == []
+    horizon_client.paginate_hwm_history.assert_not_called()
+
+
+def test_horizon_hwm_store_iter_hwm_history_skips_delta_writes(
+    horizon_hwm_store: HorizonHWMStore,
+    create_store,
+    horizon_client,
+):
+    hwm = FileListHWM(name="file_hwm", directory="/some", value=["/some/file1"])
+    horizon_hwm_store.set_hwm(hwm)
+
+    hwm_store = create_store(delta_writes=True)
+    hwm_store.set_hwm(hwm + "/some/file2")
+
+    assert [item.value for item in hwm_store.iter_hwm_history("file_hwm")] == [hwm.value]
@@ -0,0 +1,104 @@
+import time
+
+from etl_entities.hwm import ColumnIntHWM
+from horizon.commons.schemas.v1 import HWMCreateRequestV1
+
+from horizon_hwm_store.cache import LRUCache
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(max_size=10, ttl=0.01)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert not cache
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(max_size=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_horizon_hwm_store_caches_hwm_id(horizon_hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+
+    # HWM is created without lookup, and id is taken from create response
+    horizon_hwm_store.set_hwm(hwm)
+    horizon_client.paginate_hwm.assert_not_called()
+    assert horizon_client.create_hwm.call_count == 1
+
+    horizon_hwm_store.set_hwm(hwm.copy(update={"value": 2}))
+    horizon_hwm_store.set_hwm(hwm.copy(update={"value": 3}))
+
+    # no lookups at all
+    horizon_client.paginate_hwm.assert_not_called()
+    assert horizon_client.update_hwm.call_count == 2
+    assert horizon_hwm_store.get_hwm("some_hwm").value == 3
+
+
+def test_horizon_hwm_store_drops_stale_hwm_id(horizon_hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    horizon_hwm_store.set_hwm(hwm)
+
+    # HWM was recreated by someone else, so cached id is stale
+    old_id = horizon_hwm_store._hwm_ids.get((1, "some_hwm"))
+    horizon_client.fake.delete_hwm(old_id)
+    horizon_client.fake.create_hwm(
+        HWMCreateRequestV1.parse_obj({**hwm.serialize(), "value": 5, "namespace_id": 1}),
+    )
+
+    assert horizon_hwm_store.get_hwm("some_hwm").value == 5
+    assert horizon_hwm_store._hwm_ids.get((1, "some_hwm")) != old_id
+
+    horizon_hwm_store.set_hwm(hwm.copy(update={"value": 10}))
+    assert horizon_hwm_store.get_hwm("some_hwm").value == 10
+    assert len(horizon_client.fake.hwms) == 1
+
+
+def test_horizon_hwm_store_stale_hwm_id_of_deleted_hwm(horizon_hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    horizon_hwm_store.set_hwm(hwm)
+
+    horizon_client.fake.hwms.clear()
+    assert horizon_hwm_store.get_hwm("some_hwm") is None
+
+    # HWM is created again instead of failing on update
+    horizon_hwm_store.set_hwm(hwm)
+    assert horizon_hwm_store.get_hwm("some_hwm") == hwm
+
+
+def test_horizon_hwm_store_set_existing_hwm_with_unknown_id(horizon_hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    horizon_client.fake.create_hwm(
+        HWMCreateRequestV1.parse_obj({**hwm.serialize(), "namespace_id": 1}),
+    )
+
+    # create request failed, then HWM id is resolved, and HWM is updated
+    horizon_hwm_store.set_hwm(hwm.copy(update={"value": 2}))
+    assert horizon_client.create_hwm.call_count == 1
+    assert horizon_client.paginate_hwm.call_count == 1
+    assert horizon_client.update_hwm.call_count == 1
+    assert len(horizon_client.fake.hwms) == 1
+
+    # id is cached, so HWM is updated directly
+    horizon_hwm_store.set_hwm(hwm.copy(update={"value": 3}))
+    assert horizon_client.create_hwm.call_count == 1
+    assert horizon_client.paginate_hwm.call_count == 1
+    assert horizon_client.update_hwm.call_count == 2
+    assert horizon_hwm_store.get_hwm("some_hwm").value == 3
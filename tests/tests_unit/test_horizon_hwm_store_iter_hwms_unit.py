@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM, FileListHWM
+
+from horizon_hwm_store import HorizonHWMStore
+
+
+def test_horizon_hwm_store_iter_hwms(horizon_hwm_store: HorizonHWMStore, horizon_client):
+    hwms = [ColumnIntHWM(name=f"hwm_{number:02d}", value=number) for number in range(25)]
+    horizon_hwm_store.set_hwms(hwms)
+    horizon_hwm_store.set_hwm(ColumnIntHWM(name="other_hwm", value=100))
+    horizon_client.reset_mock()
+
+    assert list(horizon_hwm_store.iter_hwms(page_size=10)) == [*hwms, ColumnIntHWM(name="other_hwm", value=100)]
+    assert horizon_client.paginate_hwm.call_count == 3
+
+    assert list(horizon_hwm_store.iter_hwms(prefix="hwm_1")) == hwms[10:20]
+    assert list(horizon_hwm_store.iter_hwms(prefix="missing")) == []
+
+
+def test_horizon_hwm_store_iter_hwms_prefetches_next_page(horizon_hwm_store: HorizonHWMStore, horizon_client):
+    horizon_hwm_store.set_hwms(ColumnIntHWM(name=f"hwm_{number:02d}", value=number) for number in range(25))
+
+    second_page_requested = threading.Event()
+    paginate_hwm = horizon_client.fake.paginate_hwm
+
+    def tracking_paginate_hwm(query):
+        if query.page == 2:
+            second_page_requested.set()
+        return paginate_hwm(query)
+
+    horizon_client.paginate_hwm.side_effect = tracking_paginate_hwm
+    horizon_client.reset_mock()
+
+    hwms = horizon_hwm_store.iter_hwms(page_size=10)
+    assert next(hwms).name == "hwm_00"
+    # next page is requested while the current one is being consumed
+    assert second_page_requested.wait(timeout=5)
+
+    # generator can be abandoned at any moment
+    hwms.close()
+    assert horizon_client.paginate_hwm.call_count == 2
+
+
+def test_horizon_hwm_store_iter_hwms_skips_segments(create_store, horizon_client):
+    hwm_store = create_store(delta_writes=True)
+
+    hwm = FileListHWM(name="file_hwm", directory="/some", value=["/some/file1", "/some/file2"])
+    hwm_store.set_hwm(hwm)
+    hwm_store.set_hwm(hwm + "/some/file3")
+    assert len(horizon_client.fake.hwms) == 3
+
+    assert list(hwm_store.iter_hwms()) == [hwm + "/some/file3"]
+
+
+def test_horizon_hwm_store_iter_hwms_close_does_not_wait(horizon_hwm_store: HorizonHWMStore, horizon_client):
+    horizon_hwm_store.set_hwms(ColumnIntHWM(name=f"hwm_{number:02d}", value=number) for number in range(25))
+
+    second_page_requested = threading.Event()
+    released = threading.Event()
+    paginate_hwm = horizon_client.fake.paginate_hwm
+
+    def slow_paginate_hwm(query):
+        if query.page == 2:
+            second_page_requested.set()
+            released.wait(timeout=5)
+        return paginate_hwm(query)
+
+    horizon_client.paginate_hwm.side_effect = slow_paginate_hwm
+
+    hwms = horizon_hwm_store.iter_hwms(page_size=10)
+    assert next(hwms).name == "hwm_00"
+    assert second_page_requested.wait(timeout=5)
+
+    # running request of the next page is not awaited
+    closed = threading.Thread(target=hwms.close)
+    closed.start()
+    closed.join(timeout=1)
+    assert not closed.is_alive()
+    released.set()
+
+
+@pytest.mark.parametrize("page_size", [0, 51])
+def test_horizon_hwm_store_iter_hwms_invalid_page_size(horizon_hwm_store: HorizonHWMStore, page_size):
+    with pytest.raises(ValueError, match="page_size should be in range 1..50"):
+        horizon_hwm_store.iter_hwms(page_size=page_size)
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "asyncio",
+    "horizon.client.sync",
+    "horizon.client.auth",
+    "horizon.commons.schemas.v1",
+    "requests",
+    "authlib",
+    "sqlite3",
+]
+
+
+def test_horizon_hwm_store_import_is_lazy():
+    code = f"""
+import sys
+import horizon_hwm_store
+from etl_entities.hwm_store import HWMStoreClassRegistry
+
+assert HWMStoreClassRegistry.get("horizon") is horizon_hwm_store.HorizonHWMStore
+print([module for module in {HEAVY_MODULES!r} if module in sys.modules])
+"""
+    output = subprocess.check_output([sys.executable, "-c", code], text=True, stderr=subprocess.DEVNULL)
+    assert output.strip() == "[]"
+
+
+def test_horizon_hwm_store_resolves_field_types():
+    code = """
+from horizon.client.auth import LoginPassword
+from horizon.client.sync import RetryConfig
+
+from horizon_hwm_store import HorizonHWMStore
+
+store = HorizonHWMStore(
+    api_url="http://some.domain.com",
+    auth={"login": "user", "password": "password"},
+    namespace="namespace",
+)
+assert isinstance(store.auth, LoginPassword)
+assert isinstance(store.retry, RetryConfig)
+assert HorizonHWMStore.__fields__["auth"].type_ is LoginPassword
+"""
+    subprocess.check_call([sys.executable, "-c", code], stderr=subprocess.DEVNULL)
@@ -0,0 +1,120 @@
+import functools
+import time
+from unittest.mock import patch
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM
+from horizon.commons.exceptions import EntityNotFoundError
+from horizon.commons.schemas.v1 import NamespaceCreateRequestV1
+
+from horizon_hwm_store.horizon_hwm_store import _NAMESPACE_IDS
+from horizon_hwm_store.local_cache import LocalHWMCache
+
+
+@pytest.fixture
+def create_store(create_store, tmp_path):
+    return functools.partial(create_store, local_cache_path=tmp_path / "cache.db")
+
+
+def test_horizon_hwm_store_local_cache_reuses_ids(create_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    create_store().set_hwm(hwm)
+    horizon_client.reset_mock()
+
+    # new process
+    store = create_store()
+    store.set_hwm(hwm.copy(update={"value": 2}))
+
+    horizon_client.paginate_namespaces.assert_not_called()
+    horizon_client.paginate_hwm.assert_not_called()
+    assert horizon_client.update_hwm.call_count == 1
+
+    # value is always revalidated by default
+    assert store.get_hwm("some_hwm").value == 2
+    assert horizon_client.paginate_hwm.call_count == 1
+
+
+def test_horizon_hwm_store_local_cache_ttl(create_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    create_store().set_hwm(hwm)
+    horizon_client.reset_mock()
+
+    store = create_store(local_cache_ttl=0.1)
+    assert store.get_hwm("some_hwm") == hwm
+    assert store.get_hwms(["some_hwm"]) == {"some_hwm": hwm}
+    horizon_client.paginate_hwm.assert_not_called()
+
+    time.sleep(0.1)
+    assert store.get_hwm("some_hwm") == hwm
+    assert horizon_client.paginate_hwm.call_count == 1
+
+
+def test_horizon_hwm_store_local_cache_stale_id(create_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    create_store().set_hwm(hwm)
+
+    # HWM was deleted by someone else
+    horizon_client.fake.hwms.clear()
+
+    store = create_store()
+    assert store.get_hwm("some_hwm") is None
+    store.set_hwm(hwm)
+    assert store.get_hwm("some_hwm") == hwm
+
+
+def test_horizon_hwm_store_local_cache_namespace_id_ttl(create_store, horizon_client):
+    create_store(namespace_id_cache_ttl=10).set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+
+    # new process
+    _NAMESPACE_IDS.clear()
+    create_store(namespace_id_cache_ttl=10).get_hwm("some_hwm")
+    horizon_client.paginate_namespaces.assert_called_once()
+
+    _NAMESPACE_IDS.clear()
+    with patch("horizon_hwm_store.local_cache.time.time", return_value=time.time() + 20):
+        create_store(namespace_id_cache_ttl=10).get_hwm("some_hwm")
+    assert horizon_client.paginate_namespaces.call_count == 2
+
+
+def test_horizon_hwm_store_local_cache_namespace_recreated(create_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    create_store().set_hwms([hwm, ColumnIntHWM(name="other_hwm", value=2)])
+
+    # namespace was deleted and created again by someone else
+    horizon_client.fake.namespaces.clear()
+    horizon_client.fake.hwms.clear()
+    horizon_client.fake.create_namespace(NamespaceCreateRequestV1(name="deleted"))
+    horizon_client.fake.create_namespace(NamespaceCreateRequestV1(name="namespace"))
+    del horizon_client.fake.namespaces[1]
+
+    # new process
+    _NAMESPACE_IDS.clear()
+    store = create_store()
+    with pytest.raises(EntityNotFoundError):
+        store.set_hwm(hwm)
+
+    # stale namespace id is removed from all caches
+    assert not _NAMESPACE_IDS.get(("http://some.domain.com", "namespace"))
+    store.set_hwm(hwm)
+    assert create_store().get_hwm("some_hwm") == hwm
+
+    # HWMs of the old namespace are not read from local cache
+    horizon_client.reset_mock()
+    assert create_store(local_cache_ttl=10).get_hwm("other_hwm") is None
+    horizon_client.paginate_hwm.assert_called_once()
+
+
+def test_local_hwm_cache_max_entries(tmp_path):
+    cache = LocalHWMCache(tmp_path / "cache.db", api_url="http://some.domain.com", namespace="ns", max_entries=2)
+    for i in range(3):
+        cache.set(f"hwm_{i}", i, {"changed_at": "2025-01-01T00:00:00"})
+        time.sleep(0.01)
+
+    assert cache.get("hwm_0") is None
+    assert cache.get("hwm_1").hwm_id == 1
+    assert cache.get("hwm_2").hwm_id == 2
+
+    other_namespace = LocalHWMCache(
+        tmp_path / "cache.db", api_url="http://some.domain.com", namespace="other", max_entries=2
+    )
+    assert other_namespace.get("hwm_1") is None
@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+
+def test_horizon_hwm_store_namespace_id_shared_between_stores(create_store, horizon_client):
+    for _ in range(3):
+        assert create_store().get_hwm("some_hwm") is None
+
+    horizon_client.paginate_namespaces.assert_called_once()
+
+
+def test_horizon_hwm_store_namespace_id_cache_ttl(create_store, horizon_client):
+    with patch("time.monotonic", return_value=1000):
+        create_store(namespace_id_cache_ttl=10).get_hwm("some_hwm")
+
+    with patch("time.monotonic", return_value=1005):
+        create_store(namespace_id_cache_ttl=10).get_hwm("some_hwm")
+    horizon_client.paginate_namespaces.assert_called_once()
+
+    with patch("time.monotonic", return_value=1011):
+        create_store(namespace_id_cache_ttl=10).get_hwm("some_hwm")
+    assert horizon_client.paginate_namespaces.call_count == 2
+
+
+def test_horizon_hwm_store_check_max_age(create_store, horizon_client):
+    store = create_store()
+    with patch("time.monotonic", return_value=1000):
+        store.check(max_age=30)
+        store.check(max_age=30)
+    horizon_client.whoami.assert_called_once()
+
+    # without max_age check is always performed
+    with patch("time.monotonic", return_value=1010):
+        store.check()
+    assert horizon_client.whoami.call_count == 2
+
+    with patch("time.monotonic", return_value=2000):
+        store.check(max_age=30)
+    assert horizon_client.whoami.call_count == 3
+
+    # other credentials are checked separately
+    create_store().check(max_age=30)
+    assert horizon_client.whoami.call_count == 4
@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM
+
+from horizon_hwm_store import HorizonHWMStore
+
+
+@pytest.fixture
+def hwms(horizon_hwm_store: HorizonHWMStore, horizon_client):
+    result = [ColumnIntHWM(name=f"hwm_{number}", value=number) for number in range(3)]
+    horizon_hwm_store.set_hwms(result)
+    horizon_client.reset_mock()
+    return result
+
+
+def test_horizon_hwm_store_prefetch_on_enter(create_store, horizon_client, hwms):
+    with create_store(prefetch_hwms=["hwm_0", "hwm_1", "missing"]) as hwm_store:
+        assert hwm_store.get_hwm("hwm_0") == hwms[0]
+        assert hwm_store.get_hwm("hwm_1") == hwms[1]
+        assert hwm_store.get_hwm("missing") is None
+
+        # all HWMs were fetched by one request
+        assert horizon_client.paginate_hwm.call_count == 1
+
+        # prefetched value is used only once
+        assert hwm_store.get_hwm("hwm_0") == hwms[0]
+        assert horizon_client.paginate_hwm.call_count == 2
+
+    # not prefetched again without context
+    horizon_client.reset_mock()
+    assert hwm_store.get_hwm("hwm_1") == hwms[1]
+    assert horizon_client.paginate_hwm.call_count == 1
+
+
+def test_horizon_hwm_store_prefetch_waits_for_request(create_store, horizon_client, hwms):
+    released = threading.Event()
+    paginate_hwm = horizon_client.fake.paginate_hwm
+
+    def slow_paginate_hwm(query):
+        released.wait(timeout=5)
+        return paginate_hwm(query)
+
+    horizon_client.paginate_hwm.side_effect = slow_paginate_hwm
+    hwm_store = create_store().prefetch(["hwm_0", "hwm_1"])
+    threading.Timer(0.1, released.set).start()
+
+    # in-flight request is awaited instead of sending new one
+    assert hwm_store.get_hwm("hwm_0") == hwms[0]
+    assert hwm_store.get_hwm("hwm_1") == hwms[1]
+    assert horizon_client.paginate_hwm.call_count == 1
+    hwm_store.close()
+
+
+def test_horizon_hwm_store_prefetch_dropped_after_write(create_store, horizon_client, hwms):
+    hwm_store = create_store().prefetch(["hwm_0", "hwm_1", "hwm_2"])
+    hwm_store.set_hwm(hwms[0].copy(update={"value": 100}))
+    hwm_store.invalidate("hwm_1")
+
+    assert hwm_store.get_hwm("hwm_0").value == 100
+    assert hwm_store.get_hwm("hwm_1") == hwms[1]
+    assert hwm_store.get_hwm("hwm_2") == hwms[2]
+    hwm_store.close()
+
+
+def test_horizon_hwm_store_prefetch_failed(create_store, horizon_client, hwms):
+    paginate_hwm = horizon_client.fake.paginate_hwm
+    calls = []
+
+    def failing_once(query):
+        calls.append(query)
+        if len(calls) == 1:
+            raise ConnectionError("Connection refused")
+        return paginate_hwm(query)
+
+    horizon_client.paginate_hwm.side_effect = failing_once
+    hwm_store = create_store().prefetch(["hwm_0", "hwm_1"])
+
+    # HWM is fetched again
+    assert hwm_store.get_hwm("hwm_0") == hwms[0]
+    assert len(calls) == 2
+    hwm_store.close()
+
+
+def test_horizon_hwm_store_prefetch_hwms_config(horizon_hwm_store: HorizonHWMStore):
+    config = {**horizon_hwm_store.dict(), "prefetch_hwms": ["hwm_0", "hwm_1"]}
+    assert HorizonHWMStore.parse_obj(config).prefetch_hwms == ["hwm_0", "hwm_1"]
+
+
+def test_horizon_hwm_store_prefetch_does_not_overwrite_newer_value(create_store, horizon_client, hwms):
+    released = threading.Event()
+    paginate_hwm = horizon_client.fake.paginate_hwm
+
+    def slow_paginate_hwm(query):
+        # only background request is slow, response contains value before it was changed
+        response = paginate_hwm(query)
+        if threading.current_thread().name.startswith("HorizonHWMStore-prefetch"):
+            released.wait(timeout=5)
+        return response
+
+    horizon_client.paginate_hwm.side_effect = slow_paginate_hwm
+    with create_store(session_cache_ttl=60) as hwm_store:
+        hwm_store.prefetch(["hwm_0", "hwm_1"])
+        prefetched = hwm_store._prefetched["hwm_0"]
+
+        hwm_store.set_hwm(hwms[0].copy(update={"value": 100}))
+        released.set()
+        prefetched.result(timeout=5)
+
+        # value written by foreground thread is kept in caches
+        assert hwm_store.get_hwm("hwm_0").value == 100
+        hwm_store.set_hwm(hwms[0])
+        assert hwm_store.suppressed_writes == 0
+        assert horizon_client.fake.hwms[1].value == 0
+
+        # other HWMs are cached as usual
+        horizon_client.reset_mock()
+        assert hwm_store.get_hwm("hwm_1") == hwms[1]
+        assert hwm_store.get_hwm("hwm_1") == hwms[1]
+        horizon_client.paginate_hwm.assert_not_called()
+    hwm_store.close()
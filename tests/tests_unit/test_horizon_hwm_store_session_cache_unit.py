@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM
+
+
+@pytest.fixture
+def hwm_store(create_store):
+    return create_store(session_cache_ttl=60)
+
+
+def test_horizon_hwm_store_session_cache_read_your_writes(hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    with hwm_store:
+        hwm_store.set_hwm(hwm)
+        assert hwm_store.get_hwm("some_hwm") == hwm
+        assert hwm_store.get_hwms(["some_hwm"]) == {"some_hwm": hwm}
+        horizon_client.paginate_hwm.assert_not_called()
+
+        # returned HWM is a copy
+        hwm_store.get_hwm("some_hwm").update(2)
+        assert hwm_store.get_hwm("some_hwm").value == 1
+
+        hwm_store.invalidate("some_hwm")
+        assert hwm_store.get_hwm("some_hwm") == hwm
+        assert horizon_client.paginate_hwm.call_count == 1
+
+        # value read from server is cached too
+        assert hwm_store.get_hwm("some_hwm") == hwm
+        assert horizon_client.paginate_hwm.call_count == 1
+
+
+def test_horizon_hwm_store_session_cache_cleared_between_contexts(hwm_store, horizon_client):
+    with hwm_store:
+        hwm_store.set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+
+    # changed by someone else
+    horizon_client.fake.hwms[1].value = 5
+
+    with hwm_store:
+        assert hwm_store.get_hwm("some_hwm").value == 5
+
+    # no caching outside of context
+    horizon_client.fake.hwms[1].value = 10
+    assert hwm_store.get_hwm("some_hwm").value == 10
+
+
+def test_horizon_hwm_store_session_cache_ttl(hwm_store, horizon_client):
+    with hwm_store:
+        with patch("time.monotonic", return_value=1000):
+            hwm_store.set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+
+        with patch("time.monotonic", return_value=1061):
+            assert hwm_store.get_hwm("some_hwm").value == 1
+        assert horizon_client.paginate_hwm.call_count == 1
+
+
+def test_horizon_hwm_store_session_cache_failed_write(hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    with hwm_store:
+        hwm_store.set_hwm(hwm)
+
+        horizon_client.update_hwm.side_effect = RuntimeError("Server is unavailable")
+        with pytest.raises(RuntimeError):
+            hwm_store.set_hwm(hwm.copy(update={"value": 2}))
+
+        # value is fetched from server
+        assert hwm_store.get_hwm("some_hwm").value == 1
+        assert horizon_client.paginate_hwm.call_count == 1
+
+
+def test_horizon_hwm_store_session_cache_disabled(horizon_hwm_store, horizon_client):
+    with horizon_hwm_store:
+        horizon_hwm_store.set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+        horizon_hwm_store.get_hwm("some_hwm")
+        assert horizon_client.paginate_hwm.call_count == 1
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+from etl_entities.hwm import ColumnDateHWM, ColumnIntHWM, FileListHWM
+
+
+@pytest.mark.parametrize(
+    "hwm",
+    [
+        ColumnIntHWM(name="some_hwm", value=1, entity="table", expression="id"),
+        ColumnDateHWM(name="some_hwm", value=date(2025, 1, 1)),
+        FileListHWM(name="some_hwm", value=["/some/file1", "/some/file2"], directory="/some"),
+    ],
+)
+def test_horizon_hwm_store_skips_unchanged_hwm(horizon_hwm_store, horizon_client, hwm):
+    horizon_hwm_store.set_hwm(hwm)
+    assert horizon_client.create_hwm.call_count == 1
+
+    url = horizon_hwm_store.set_hwm(hwm.copy())
+    assert url == "http://some.domain.com/v1/hwm/1"
+    horizon_client.update_hwm.assert_not_called()
+    assert horizon_hwm_store.suppressed_writes == 1
+
+    # value is changed
+    horizon_hwm_store.set_hwm(hwm.copy(update={"description": "changed"}))
+    assert horizon_client.update_hwm.call_count == 1
+    assert horizon_hwm_store.suppressed_writes == 1
+
+
+def test_horizon_hwm_store_skips_hwm_unchanged_after_read(horizon_hwm_store, horizon_client):
+    horizon_hwm_store.set_hwm(ColumnIntHWM(name="some_hwm", value=1))
+
+    # another store instance
+    horizon_hwm_store._hwm_ids.clear()
+    horizon_hwm_store._known_hwms.clear()
+
+    hwm = horizon_hwm_store.get_hwm("some_hwm")
+    horizon_hwm_store.set_hwm(hwm)
+    horizon_client.update_hwm.assert_not_called()
+    assert horizon_hwm_store.suppressed_writes == 1
+
+    horizon_hwm_store.set_hwms([hwm, hwm.copy(update={"name": "other_hwm"})])
+    horizon_client.update_hwm.assert_not_called()
+    assert horizon_client.create_hwm.call_count == 2
+    assert horizon_hwm_store.suppressed_writes == 2
+
+
+def test_horizon_hwm_store_force_writes(create_store, horizon_client):
+    store = create_store(force_writes=True)
+
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    store.set_hwm(hwm)
+    store.set_hwm(hwm)
+    assert horizon_client.update_hwm.call_count == 1
+    assert store.suppressed_writes == 0
@@ -0,0 +1,115 @@
+import os
+import secrets
+import stat
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from horizon.client.auth import LoginPassword
+from horizon.client.sync import HorizonClientSync
+from horizon.commons.exceptions import AuthorizationError
+
+from horizon_hwm_store import HorizonHWMStore
+from horizon_hwm_store.token_cache import TokenCache
+
+
+@pytest.fixture
+def store_options(tmp_path):
+    return {
+        "api_url": "http://some.domain.com",
+        "auth": LoginPassword(login="user", password=secrets.token_hex()),
+        "namespace": "namespace",
+        "share_client": False,
+        "token_cache_path": tmp_path / "tokens.json",
+    }
+
+
+def fake_login(client):
+    client.session.token = {
+        "access_token": secrets.token_hex(),
+        "token_type": "bearer",
+        "expires_at": time.time() + 3600,
+    }
+
+
+def test_horizon_hwm_store_token_cache_reuses_token(store_options):
+    with patch.object(HorizonClientSync, "authorize", autospec=True, side_effect=fake_login) as login:
+        store1 = HorizonHWMStore(**store_options)
+        store1.client.authorize()
+        store2 = HorizonHWMStore(**store_options)
+        store2.client.authorize()
+
+    login.assert_called_once()
+    assert store2.client.session.token["access_token"] == store1.client.session.token["access_token"]
+
+    token_file = store_options["token_cache_path"]
+    assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
+
+    # other process with empty memory cache reads the file
+    with patch.object(TokenCache, "_tokens", {}), patch.object(HorizonClientSync, "authorize", autospec=True) as login:
+        store3 = HorizonHWMStore(**store_options)
+        store3.client.authorize()
+
+    login.assert_not_called()
+    assert store3.client.session.token["access_token"] == store1.client.session.token["access_token"]
+
+
+def test_horizon_hwm_store_token_cache_disabled(store_options):
+    with patch.object(HorizonClientSync, "authorize", autospec=True, side_effect=fake_login) as login:
+        for _ in range(2):
+            HorizonHWMStore(**store_options, token_cache=False).client.authorize()
+
+    assert login.call_count == 2
+    assert not store_options["token_cache_path"].exists()
+
+
+def test_horizon_hwm_store_token_cache_file_accessible_by_others(store_options):
+    with patch.object(HorizonClientSync, "authorize", autospec=True, side_effect=fake_login):
+        HorizonHWMStore(**store_options).client.authorize()
+
+    os.chmod(store_options["token_cache_path"], 0o644)
+
+    with patch.object(TokenCache, "_tokens", {}), patch.object(
+        HorizonClientSync,
+        "authorize",
+        autospec=True,
+        side_effect=fake_login,
+    ) as login:
+        HorizonHWMStore(**store_options).client.authorize()
+
+    login.assert_called_once()
+
+
+def test_horizon_hwm_store_token_cache_token_rejected(store_options):
+    with patch.object(HorizonClientSync, "authorize", autospec=True, side_effect=fake_login):
+        HorizonHWMStore(**store_options).client.authorize()
+
+    store = HorizonHWMStore(**store_options)
+    response = Mock()
+    with patch.object(HorizonClientSync, "authorize", autospec=True, side_effect=fake_login) as login, patch.object(
+        HorizonClientSync,
+        "_handle_response",
+        side_effect=[AuthorizationError("Invalid token"), response],
+    ), patch.object(store.client.session, "request"):
+        assert store.client._request("GET", "http://some.domain.com/v1/users/me") is response
+
+    # cached token was replaced with a new one
+    login.assert_called_once()
+    assert TokenCache(store_options["token_cache_path"]).get(store.client._token_cache_key) == dict(
+        store.client.session.token,
+    )
+
+
+def test_horizon_hwm_store_token_cache_expired_token_is_not_used(store_options):
+    cache = TokenCache(store_options["token_cache_path"])
+    store = HorizonHWMStore(**store_options)
+    cache.set(
+        store.client._token_cache_key,
+        {"access_token": "expired", "token_type": "bearer", "expires_at": time.time() + 1},
+    )
+
+    with patch.object(HorizonClientSync, "authorize", autospec=True, side_effect=fake_login) as login:
+        store.client.authorize()
+
+    login.assert_called_once()
+    assert store.client.session.token["access_token"] != "expired"
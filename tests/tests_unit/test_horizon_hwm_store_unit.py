@@ -1,9 +1,19 @@
 import logging
 import secrets
+from datetime import date, datetime, timezone
+from unittest.mock import Mock
 
 import pytest
+from etl_entities.hwm import (
+    ColumnDateHWM,
+    ColumnIntHWM,
+    FileListHWM,
+    HWMTypeRegistry,
+    KeyValueIntHWM,
+)
 from etl_entities.hwm_store import HWMStoreStackManager
 from horizon.client.auth import LoginPassword
+from horizon.commons.schemas.v1 import HWMPaginateQueryV1, HWMResponseV1
 
 from horizon_hwm_store import HorizonHWMStore
 
@@ -80,3 +90,55 @@ def test_horizon_hwm_no_schema():
             auth=LoginPassword(login=secrets.token_hex(), password=secrets.token_hex()),
             namespace=secrets.token_hex(),
         )
+
+
+def test_horizon_hwm_store_get_hwm_single_request(horizon_hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    horizon_hwm_store.set_hwm(hwm)
+    horizon_client.reset_mock()
+
+    assert horizon_hwm_store.get_hwm("some_hwm") == hwm
+    assert horizon_client.paginate_hwm.call_count == 1
+    horizon_client.get_hwm.assert_not_called()
+
+
+def test_horizon_hwm_store_get_hwm_list_response_without_value(horizon_hwm_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    horizon_hwm_store.set_hwm(hwm)
+
+    # emulate server which does not return HWM values in list response
+    page = horizon_client.fake.paginate_hwm(HWMPaginateQueryV1(namespace_id=1))
+    item = page.items[0]
+    fields = {key: value for key, value in item.dict().items() if key != "value"}
+    page.items[0] = item.construct(_fields_set=set(fields), **fields)
+    horizon_client.paginate_hwm = Mock(return_value=page)
+
+    assert horizon_hwm_store.get_hwm("some_hwm") == hwm
+    horizon_client.get_hwm.assert_called_once_with(item.id)
+
+
+@pytest.mark.parametrize(
+    "hwm",
+    [
+        ColumnIntHWM(name="some_hwm", value=1, entity="table", expression="id"),
+        ColumnDateHWM(name="some_hwm", value=date(2025, 1, 1)),
+        FileListHWM(name="some_hwm", value=["/some/file1", "/some/file2"], directory="/some"),
+        KeyValueIntHWM(name="some_hwm", value={0: 10, 1: 20}, entity="topic"),
+    ],
+)
+def test_horizon_hwm_store_parse_hwm(hwm):
+    hwm_data = hwm.serialize()
+    modified_time = datetime.now(tz=timezone.utc)
+    response = HWMResponseV1.parse_raw(
+        HWMResponseV1(
+            id=1,
+            namespace_id=1,
+            changed_at=modified_time,
+            changed_by="user",
+            **{key: value for key, value in hwm_data.items() if key != "modified_time"},
+        ).json(),
+    )
+
+    result = HorizonHWMStore._parse_hwm(response)
+    assert result == HWMTypeRegistry.parse({**hwm_data, "modified_time": modified_time})
+    assert result.modified_time == modified_time
@@ -0,0 +1,130 @@
+import atexit
+import functools
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from etl_entities.hwm import ColumnIntHWM
+
+
+@pytest.fixture
+def create_store(create_store, tmp_path):
+    return functools.partial(create_store, write_behind=True, write_behind_journal=tmp_path / "journal.jsonl")
+
+
+@pytest.fixture
+def write_behind_store(create_store):
+    return create_store()
+
+
+def test_horizon_hwm_store_write_behind(write_behind_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=0)
+
+    with write_behind_store:
+        for i in range(10):
+            location = write_behind_store.set_hwm(hwm.copy(update={"value": i}))
+            assert location == "http://some.domain.com/v1/hwm/?namespace_id=1&name=some_hwm"
+            # pending value is visible to the store
+            assert write_behind_store.get_hwm("some_hwm").value == i
+
+        horizon_client.create_hwm.assert_not_called()
+        horizon_client.update_hwm.assert_not_called()
+        assert write_behind_store.write_behind_journal.exists()
+
+    # only the last value is sent on exit
+    assert horizon_client.create_hwm.call_count == 1
+    horizon_client.update_hwm.assert_not_called()
+    assert not write_behind_store.write_behind_journal.exists()
+    assert write_behind_store.get_hwm("some_hwm").value == 9
+
+    # HWM id is known now
+    assert write_behind_store.set_hwm(hwm) == "http://some.domain.com/v1/hwm/1"
+    assert write_behind_store.flush() == {"some_hwm": "http://some.domain.com/v1/hwm/1"}
+    assert write_behind_store.flush() == {}
+
+
+def test_horizon_hwm_store_write_behind_failed_flush(write_behind_store, horizon_client):
+    error = RuntimeError("Server is unavailable")
+    horizon_client.create_hwm.side_effect = error
+
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    with pytest.raises(RuntimeError, match="Failed to flush HWMs \\['some_hwm'\\]"):
+        with write_behind_store:
+            write_behind_store.set_hwm(hwm)
+
+    # HWM is kept in memory and in journal
+    assert write_behind_store.flush() == {"some_hwm": error}
+    assert write_behind_store.write_behind_journal.exists()
+
+    horizon_client.create_hwm.side_effect = None
+    assert write_behind_store.flush() == {"some_hwm": "http://some.domain.com/v1/hwm/1"}
+    assert not write_behind_store.write_behind_journal.exists()
+
+
+def test_horizon_hwm_store_write_behind_journal_replay(create_store, write_behind_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+    write_behind_store.set_hwm(hwm)
+    write_behind_store.set_hwm(hwm.copy(update={"value": 2}))
+
+    # emulate process crash, pending HWMs are lost but journal is kept
+    atexit.unregister(write_behind_store._flush_at_exit)
+    new_store = create_store()
+
+    with new_store:
+        assert new_store.get_hwm("some_hwm").value == 2
+
+    assert horizon_client.create_hwm.call_count == 1
+    assert not new_store.write_behind_journal.exists()
+    assert new_store.get_hwm("some_hwm").value == 2
+
+
+def test_horizon_hwm_store_write_behind_set_hwms(write_behind_store, horizon_client):
+    hwm = ColumnIntHWM(name="some_hwm", value=1)
+
+    with write_behind_store:
+        write_behind_store.set_hwm(hwm)
+        results = write_behind_store.set_hwms([hwm.copy(update={"value": 2}), ColumnIntHWM(name="other_hwm", value=3)])
+        assert results == {
+            "some_hwm": "http://some.domain.com/v1/hwm/?namespace_id=1&name=some_hwm",
+            "other_hwm": "http://some.domain.com/v1/hwm/?namespace_id=1&name=other_hwm",
+        }
+        horizon_client.create_hwm.assert_not_called()
+        assert write_behind_store.get_hwm("some_hwm").value == 2
+
+    # buffered value is not sent after the newer one
+    assert horizon_client.create_hwm.call_count == 2
+    horizon_client.update_hwm.assert_not_called()
+    assert {hwm.name: hwm.value for hwm in horizon_client.fake.hwms.values()} == {"some_hwm": 2, "other_hwm": 3}
+
+
+def test_horizon_hwm_store_write_behind_flush_at_exit(tmp_path):
+    # thread pools cannot be used in atexit hooks, but all pending HWMs should be sent anyway
+    code = f"""
+import atexit
+import sys
+
+sys.path.insert(0, {str(Path(__file__).parent)!r})
+from conftest import FakeHorizonClient
+
+from etl_entities.hwm import ColumnIntHWM
+from horizon_hwm_store import HorizonHWMStore
+
+client = FakeHorizonClient()
+# hooks are called in reverse order, so this one is called after flushing HWMs
+atexit.register(lambda: print(sorted({{hwm.name: hwm.value for hwm in client.hwms.values()}}.items())))
+
+store = HorizonHWMStore(
+    api_url="http://some.domain.com",
+    auth={{"login": "user", "password": "password"}},
+    namespace="namespace",
+    write_behind=True,
+    write_behind_journal={str(tmp_path / "journal.jsonl")!r},
+)
+store._client = client
+store.force_create_namespace()
+store.set_hwms([ColumnIntHWM(name="some_hwm", value=1), ColumnIntHWM(name="other_hwm", value=2)])
+"""
+    output = subprocess.check_output([sys.executable, "-c", code], text=True, stderr=subprocess.DEVNULL)
+    assert output.strip() == "[('other_hwm', 2), ('some_hwm', 1)]"
+    assert not (tmp_path / "journal.jsonl").exists()